@@ -1,3 +1,4 @@
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 
@@ -10,8 +11,61 @@ class Settings(BaseSettings):
     retell_api_key: str
     openai_api_key: str
     openai_model: str = "gpt-4o"
+    openai_small_model: str = "gpt-4o-mini"
+    openai_model_prices: Dict[str, List[float]] = {"gpt-4o": [2.5, 10.0], "gpt-4o-mini": [0.15, 0.6]}
+    model_routing_enabled: bool = True
+    routing_extraction_small_max_chars: int = 2500
+    routing_prompt_small_max_chars: int = 600
+    routing_min_confidence: float = 0.85
+    extraction_schema_max_fields: int = 24
+    extraction_max_attempts: int = 2
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 30000
+    openai_max_retries: int = 5
+    openai_backoff_base_seconds: float = 1.0
+    openai_backoff_max_seconds: float = 60.0
     retell_default_voice_id: str = "11labs-Adrian"
     webhook_base_url: str = "http://localhost:8000"
+    retell_call_cache_ttl_seconds: float = 30.0
+    retell_call_cache_max_entries: int = 1000
+    bulk_prompt_concurrency: int = 4
+    bulk_retell_concurrency: int = 4
+    bulk_insert_batch_size: int = 50
+    driver_import_batch_size: int = 500
+    default_phone_country_code: str = "1"
+    live_extraction_min_new_utterances: int = 2
+    live_transcript_polling_enabled: bool = False
+    live_transcript_poll_interval_seconds: float = 5.0
+    live_transcript_poll_concurrency: int = 5
+    lease_ttl_seconds: int = 60
+    last_used_flush_interval_seconds: float = 5.0
+    processing_stale_after_seconds: int = 600
+    processing_mode: str = "inline"
+    worker_concurrency: int = 4
+    worker_poll_interval_seconds: float = 2.0
+    worker_job_lock_seconds: int = 900
+    worker_max_attempts: int = 5
+    worker_retry_base_seconds: float = 5.0
+    worker_retry_max_seconds: float = 300.0
+    worker_drain_timeout_seconds: float = 30.0
+    shutdown_drain_timeout_seconds: float = 25.0
+    sweeper_enabled: bool = True
+    sweeper_interval_seconds: float = 60.0
+    sweeper_stale_after_seconds: int = 900
+    sweeper_batch_size: int = 100
+    sweeper_check_concurrency: int = 5
+    sweeper_finalize_concurrency: int = 2
+    sweeper_max_attempts: int = 20
+    export_batch_size: int = 500
+    transcript_storage_mode: str = "messages"
+    message_page_size: int = 200
+    archive_enabled: bool = False
+    archive_after_days: int = 180
+    archive_interval_seconds: float = 3600.0
+    archive_batch_size: int = 200
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
 
 settings = Settings()
 
@@ -1,13 +1,64 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import agents, drivers, conversations, test_calls, webhooks
+from app.config import settings
+from app.middleware.compression import CompressionMiddleware
+from app.responses import ORJSONResponse
+from app.routes import agents, drivers, conversations, test_calls, webhooks, sweeper, analytics, archive, model_routing
+from app.services.archive_service import get_conversation_archiver
+from app.services.last_used_buffer import get_last_used_buffer
+from app.services.live_extraction_service import LiveTranscriptPoller
+from app.services.sweeper_service import get_conversation_sweeper
+from app.services.task_registry import get_task_registry
+from app.worker import Worker
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = [asyncio.create_task(get_last_used_buffer().run())]
+    if settings.live_transcript_polling_enabled:
+        background_tasks.append(asyncio.create_task(LiveTranscriptPoller().run()))
+    if settings.sweeper_enabled:
+        background_tasks.append(asyncio.create_task(get_conversation_sweeper().run()))
+    if settings.archive_enabled:
+        background_tasks.append(asyncio.create_task(get_conversation_archiver().run()))
+    
+    worker = None
+    worker_task = None
+    if settings.processing_mode == "inline":
+        worker = Worker(settings.worker_concurrency)
+        worker_task = asyncio.create_task(worker.run())
+    
+    yield
+    
+    if worker:
+        worker.stop()
+    await asyncio.gather(
+        get_task_registry().drain(settings.shutdown_drain_timeout_seconds),
+        *([worker_task] if worker_task else [])
+    )
+    
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    
+    await get_last_used_buffer().flush()
 
 app = FastAPI(
     title="E3 Backend API",
     description="API for managing agents, drivers, and test call conversations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality
 )
 
 app.add_middleware(
@@ -20,7 +71,7 @@ app.add_middleware(
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"detail": exc.errors()}
     )
@@ -29,7 +80,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def general_exception_handler(request: Request, exc: Exception):
     import traceback
     traceback.print_exc()
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
@@ -39,6 +90,10 @@ app.include_router(drivers.router)
 app.include_router(conversations.router)
 app.include_router(test_calls.router)
 app.include_router(webhooks.router)
+app.include_router(sweeper.router)
+app.include_router(analytics.router)
+app.include_router(archive.router)
+app.include_router(model_routing.router)
 
 @app.get("/")
 async def root():
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 
 class AgentCreate(BaseModel):
@@ -22,6 +22,7 @@ class AgentResponse(BaseModel):
     additional_details: Optional[str]
     scenario_description: Optional[str]
     system_prompt: Optional[str]
+    extraction_schema: Optional[Dict[str, Any]] = None
     retell_agent_id: Optional[str]
     created_at: datetime
     last_used_at: Optional[datetime]
@@ -40,3 +41,20 @@ class GeneratePromptRequest(BaseModel):
 class GeneratePromptResponse(BaseModel):
     system_prompt: str
 
+
+class AgentBulkCreateRequest(BaseModel):
+    agents: List[AgentCreate]
+
+class AgentBulkItemResult(BaseModel):
+    name: str
+    status: str
+    agent_id: Optional[UUID] = None
+    retell_agent_id: Optional[str] = None
+    error: Optional[str] = None
+
+class AgentBulkCreateResponse(BaseModel):
+    total: int
+    created: int
+    skipped: int
+    failed: int
+    results: List[AgentBulkItemResult]
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Dict, List
+from uuid import UUID
+
+class AnalyticsGroupBy(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    AGENT = "agent"
+    DRIVER = "driver"
+
+class AnalyticsBucket(BaseModel):
+    key: str
+    label: str
+    calls: int
+    completed: int
+    failed: int
+    emergencies: int
+    emergency_rate: Optional[float]
+    avg_duration_ms: Optional[float]
+    extraction_success_rate: Optional[float]
+    outcomes: Dict[str, int]
+
+class AnalyticsResponse(BaseModel):
+    start: datetime
+    end: datetime
+    group_by: AnalyticsGroupBy
+    agent_id: Optional[UUID] = None
+    driver_id: Optional[UUID] = None
+    totals: AnalyticsBucket
+    buckets: List[AnalyticsBucket]
@@ -1,12 +1,14 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 from enum import Enum
+from app.models.message import MessageResponse
 
 class ConversationStatus(str, Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
+    PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
 
@@ -29,6 +31,7 @@ class ConversationResponse(BaseModel):
     transcript: Optional[str] = None
     duration_ms: Optional[int] = None
     structured_data: Optional[Dict[str, Any]] = None
+    emergency_detected: Optional[bool] = None
 
 class ConversationListResponse(BaseModel):
     id: UUID
@@ -40,11 +43,34 @@ class ConversationListResponse(BaseModel):
     status: ConversationStatus
     started_at: datetime
     completed_at: Optional[datetime]
+    emergency_detected: Optional[bool] = None
+    call_outcome: Optional[str] = None
+    emergency_type: Optional[str] = None
+    eta: Optional[str] = None
+    is_load_secure: Optional[bool] = None
+    customer: Optional[str] = None
+    detention_minutes: Optional[int] = None
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    PARQUET = "parquet"
+
+class ConversationListFilters(BaseModel):
+    status: Optional[ConversationStatus] = None
+    call_outcome: Optional[str] = None
+    emergency_type: Optional[str] = None
+    customer: Optional[str] = None
+    is_load_secure: Optional[bool] = None
+    emergency_detected: Optional[bool] = None
+    started_after: Optional[datetime] = None
+    started_before: Optional[datetime] = None
 
 class ConversationStatusResponse(BaseModel):
     id: UUID
     status: ConversationStatus
     completed_at: Optional[datetime]
+    emergency_detected: Optional[bool] = None
 
 class StructuredDataResponse(BaseModel):
     conversation_id: UUID
@@ -52,3 +78,39 @@ class StructuredDataResponse(BaseModel):
     recording_url: Optional[str]
     duration_ms: Optional[int]
 
+
+class ConversationDetailResponse(BaseModel):
+    id: UUID
+    agent_id: UUID
+    agent_name: Optional[str] = None
+    driver_id: UUID
+    driver_name: Optional[str] = None
+    load_number: str
+    status: ConversationStatus
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    retell_call_id: Optional[str] = None
+    retell_access_token: Optional[str] = None
+    recording_url: Optional[str] = None
+    duration_ms: Optional[int] = None
+    emergency_detected: Optional[bool] = None
+    transcript: Optional[str] = None
+    structured_data: Optional[Dict[str, Any]] = None
+    messages: Optional[List[MessageResponse]] = None
+
+class ConversationSearchResult(BaseModel):
+    id: UUID
+    load_number: str
+    status: ConversationStatus
+    started_at: datetime
+    agent_name: Optional[str] = None
+    driver_name: Optional[str] = None
+    rank: float
+    snippet: Optional[str] = None
+
+class ConversationSearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[ConversationSearchResult]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 
 class DriverCreate(BaseModel):
@@ -17,3 +17,19 @@ class DriverResponse(BaseModel):
     phone_number: str
     created_at: datetime
 
+class DriverSearchResult(DriverResponse):
+    score: float
+
+class DriverImportRejection(BaseModel):
+    row: int
+    name: Optional[str] = None
+    phone_number: Optional[str] = None
+    error: str
+
+class DriverImportResponse(BaseModel):
+    total: int
+    inserted: int
+    updated: int
+    unchanged: int
+    rejected: int
+    rejections: List[DriverImportRejection]
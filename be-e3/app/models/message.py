@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 from enum import Enum
 
@@ -7,10 +8,20 @@ class MessageRole(str, Enum):
     AGENT = "agent"
     HUMAN = "human"
 
+class MessageFormat(str, Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+
 class MessageCreate(BaseModel):
     conversation_id: UUID
     role: MessageRole
     content: str
+    seq: Optional[int] = None
+
+class WordTiming(BaseModel):
+    word: str
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
 
 class MessageResponse(BaseModel):
     id: UUID
@@ -18,4 +29,8 @@ class MessageResponse(BaseModel):
     role: MessageRole
     content: str
     created_at: datetime
+    seq: Optional[int] = None
+    start_ms: Optional[int] = None
+    end_ms: Optional[int] = None
+    words: Optional[List[WordTiming]] = None
 
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import List
+from app.models.agent import AgentCreate, AgentBulkItemResult
+from app.services.agent_service import AgentService
+
+logger = logging.getLogger(__name__)
+
+def load_manifest(path: Path) -> List[AgentCreate]:
+    text = path.read_text()
+    if path.suffix in (".yaml", ".yml"):
+        import yaml
+        manifest = yaml.safe_load(text)
+    else:
+        manifest = json.loads(text)
+    
+    if isinstance(manifest, dict):
+        manifest = manifest.get("agents", [])
+    return [AgentCreate(**item) for item in manifest]
+
+def print_progress(result: AgentBulkItemResult) -> None:
+    line = f"[{result.status}] {result.name}"
+    if result.agent_id:
+        line += f" ({result.agent_id})"
+    if result.error:
+        line += f": {result.error}"
+    print(line, flush=True)
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Provision agents in bulk from a JSON or YAML scenario manifest")
+    parser.add_argument("manifest", type=Path)
+    parser.add_argument("--prompt-concurrency", type=int, default=None)
+    parser.add_argument("--retell-concurrency", type=int, default=None)
+    args = parser.parse_args()
+    
+    agents = load_manifest(args.manifest)
+    service = AgentService()
+    result = await service.bulk_create_agents(
+        agents,
+        prompt_concurrency=args.prompt_concurrency,
+        retell_concurrency=args.retell_concurrency,
+        on_progress=print_progress
+    )
+    print(f"{result.total} agents: {result.created} created, {result.skipped} skipped, {result.failed} failed")
+    return 1 if result.failed else 0
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main()))
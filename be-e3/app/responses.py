@@ -0,0 +1,18 @@
+from typing import Any, Optional
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+class ValidatedJSONResponse(Response):
+    media_type = "application/json"
+    
+    def __init__(self, content: Any, adapter: TypeAdapter, status_code: int = 200, headers: Optional[dict] = None):
+        self.adapter = adapter
+        super().__init__(content=content, status_code=status_code, headers=headers)
+    
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
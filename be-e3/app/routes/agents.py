@@ -2,10 +2,11 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 from uuid import UUID
-from app.models.agent import AgentCreate, AgentUpdate, AgentResponse, AgentListResponse, GeneratePromptRequest, GeneratePromptResponse
-from app.services.agent_service import AgentService
+from app.models.agent import AgentCreate, AgentUpdate, AgentResponse, AgentListResponse, GeneratePromptRequest, GeneratePromptResponse, AgentBulkCreateRequest, AgentBulkCreateResponse
+from app.services.agent_service import AgentService, AGENT_LIST_ADAPTER
 from app.services.prompt_generation_service import PromptGenerationService
 from app.dependencies import verify_api_key
+from app.responses import ValidatedJSONResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/agents", tags=["agents"])
@@ -51,12 +52,32 @@ async def create_agent(
             detail=f"Failed to create agent: {str(e)}"
         )
 
+@router.post("/bulk", response_model=AgentBulkCreateResponse)
+async def bulk_create_agents(
+    request: AgentBulkCreateRequest,
+    _: str = Depends(verify_api_key)
+):
+    logger.info(f"API request to bulk create {len(request.agents)} agents")
+    try:
+        service = AgentService()
+        result = await service.bulk_create_agents(request.agents)
+        logger.info(f"Bulk created agents via API: {result.created} created, {result.failed} failed")
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in bulk_create_agents endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to bulk create agents: {str(e)}"
+        )
+
 @router.get("/", response_model=List[AgentListResponse])
 async def list_agents(_: str = Depends(verify_api_key)):
     logger.debug("API request to list agents")
     try:
         service = AgentService()
-        return await service.list_agents()
+        return ValidatedJSONResponse(await service.list_agents(), AGENT_LIST_ADAPTER)
     except Exception as e:
         logger.error(f"Error in list_agents endpoint: {e}")
         raise HTTPException(
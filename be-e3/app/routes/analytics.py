@@ -0,0 +1,39 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.models.analytics import AnalyticsGroupBy, AnalyticsResponse
+from app.services.analytics_service import AnalyticsService
+from app.dependencies import verify_api_key
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+@router.get("", response_model=AnalyticsResponse)
+async def get_analytics(
+    start: Optional[datetime] = Query(None, description="Inclusive start, defaults to 24 hours before end"),
+    end: Optional[datetime] = Query(None, description="Exclusive end, defaults to now"),
+    group_by: AnalyticsGroupBy = Query(AnalyticsGroupBy.HOUR),
+    agent_id: Optional[UUID] = None,
+    driver_id: Optional[UUID] = None,
+    _: str = Depends(verify_api_key)
+):
+    logger.debug(f"API request to get analytics grouped by {group_by.value}")
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    try:
+        service = AnalyticsService()
+        return await service.get_rollup(start, end, group_by, agent_id, driver_id)
+    except Exception as e:
+        logger.error(f"Error in get_analytics endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get analytics: {str(e)}"
+        )
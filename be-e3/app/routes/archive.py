@@ -0,0 +1,24 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.services.archive_service import get_conversation_archiver
+from app.dependencies import verify_api_key
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/archive", tags=["archive"])
+
+@router.get("/status")
+async def get_archive_status(_: str = Depends(verify_api_key)):
+    logger.debug("API request to get archiver status")
+    return get_conversation_archiver().stats
+
+@router.post("/run")
+async def run_archiver(_: str = Depends(verify_api_key)):
+    logger.info("API request to run archiver")
+    try:
+        return await get_conversation_archiver().archive_once()
+    except Exception as e:
+        logger.error(f"Error in run_archiver endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to run archiver: {str(e)}"
+        )
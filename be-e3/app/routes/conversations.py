@@ -1,22 +1,31 @@
+import importlib.util
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+import orjson
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID
-from app.models.conversation import ConversationListResponse, ConversationResponse, ConversationStatusResponse, StructuredDataResponse
-from app.models.message import MessageResponse
-from app.services.conversation_service import ConversationService
+from app.models.conversation import ExportFormat, ConversationListFilters, ConversationListResponse, ConversationResponse, ConversationStatusResponse, StructuredDataResponse, ConversationDetailResponse, ConversationSearchResponse
+from app.models.message import MessageFormat, MessageResponse
+from app.services.conversation_service import ConversationService, DETAIL_INCLUDE_FIELDS, CONVERSATION_LIST_ADAPTER, MESSAGE_LIST_ADAPTER
+from app.services.export_service import ExportService, EXPORT_INCLUDE_FIELDS, EXPORT_MEDIA_TYPES, EXPORT_WRITERS, export_fields
 from app.database.client import get_supabase
 from app.dependencies import verify_api_key
+from app.responses import ValidatedJSONResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 
 @router.get("/", response_model=List[ConversationListResponse])
-async def list_conversations(_: str = Depends(verify_api_key)):
+async def list_conversations(
+    filters: ConversationListFilters = Depends(),
+    _: str = Depends(verify_api_key)
+):
     logger.debug("API request to list conversations")
     try:
         service = ConversationService()
-        return await service.list_conversations()
+        return ValidatedJSONResponse(await service.list_conversations(filters), CONVERSATION_LIST_ADAPTER)
     except Exception as e:
         logger.error(f"Error in list_conversations endpoint: {e}")
         raise HTTPException(
@@ -24,6 +33,58 @@ async def list_conversations(_: str = Depends(verify_api_key)):
             detail=f"Failed to list conversations: {str(e)}"
         )
 
+@router.get("/export")
+async def export_conversations(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    include: Optional[str] = Query(None, description="Comma-separated subset of: transcript, messages"),
+    filters: ConversationListFilters = Depends(),
+    _: str = Depends(verify_api_key)
+):
+    logger.info(f"API request to export conversations as {format.value}")
+    
+    fields = set()
+    if include:
+        fields = {field.strip() for field in include.split(",") if field.strip()}
+        unknown = fields - EXPORT_INCLUDE_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown include fields: {', '.join(sorted(unknown))}"
+            )
+    
+    if format == ExportFormat.PARQUET and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export requires pyarrow to be installed"
+        )
+    
+    service = ExportService()
+    chunks = EXPORT_WRITERS[format](service.iter_batches(filters, fields), export_fields(fields))
+    filename = f"conversations-{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.{format.value}"
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/search", response_model=ConversationSearchResponse)
+async def search_conversations(
+    q: str = Query(..., min_length=2, max_length=200, description="Words or a quoted phrase to find in transcripts and messages"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    _: str = Depends(verify_api_key)
+):
+    logger.debug(f"API request to search conversations: {q}")
+    try:
+        service = ConversationService()
+        return await service.search_conversations(q, limit, offset)
+    except Exception as e:
+        logger.error(f"Error in search_conversations endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search conversations: {str(e)}"
+        )
+
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
     conversation_id: UUID,
@@ -42,15 +103,55 @@ async def get_conversation(
             detail=f"Failed to get conversation: {str(e)}"
         )
 
+@router.get("/{conversation_id}/detail", response_model=ConversationDetailResponse, response_model_exclude_unset=True)
+async def get_conversation_detail(
+    conversation_id: UUID,
+    include: Optional[str] = Query(None, description="Comma-separated subset of: agent, driver, transcript, structured_data, messages"),
+    _: str = Depends(verify_api_key)
+):
+    logger.debug(f"API request to get conversation detail: {conversation_id}")
+    
+    fields = DETAIL_INCLUDE_FIELDS
+    if include is not None:
+        fields = {field.strip() for field in include.split(",") if field.strip()}
+        unknown = fields - DETAIL_INCLUDE_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown include fields: {', '.join(sorted(unknown))}"
+            )
+    
+    try:
+        service = ConversationService()
+        return await service.get_conversation_detail(conversation_id, fields)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_conversation_detail endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get conversation detail: {str(e)}"
+        )
+
 @router.get("/{conversation_id}/messages", response_model=List[MessageResponse])
 async def get_conversation_messages(
     conversation_id: UUID,
+    after: Optional[int] = Query(None, ge=0, description="Return messages with a sequence number greater than this"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    words: bool = Query(False, description="Include word timings for compactly stored transcripts"),
+    format: MessageFormat = Query(MessageFormat.JSON),
     _: str = Depends(verify_api_key)
 ):
     logger.debug(f"API request to get messages for conversation: {conversation_id}")
+    service = ConversationService()
+    
+    if format == MessageFormat.NDJSON:
+        pages = service.iter_message_pages(conversation_id, after, limit, words)
+        return StreamingResponse(_ndjson_messages(conversation_id, pages), media_type="application/x-ndjson")
+    
     try:
-        service = ConversationService()
-        return await service.get_conversation_messages(conversation_id)
+        messages = await service.get_conversation_messages(conversation_id, after, limit, words)
+        return ValidatedJSONResponse(messages, MESSAGE_LIST_ADAPTER)
     except Exception as e:
         logger.error(f"Error in get_conversation_messages endpoint: {e}")
         raise HTTPException(
@@ -58,6 +159,14 @@ async def get_conversation_messages(
             detail=f"Failed to get messages: {str(e)}"
         )
 
+async def _ndjson_messages(conversation_id: UUID, pages: AsyncIterator[List[Dict]]) -> AsyncIterator[bytes]:
+    try:
+        async for rows in pages:
+            yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+    except Exception as e:
+        logger.error(f"Error streaming messages for conversation {conversation_id}: {e}")
+        raise
+
 @router.get("/{conversation_id}/status", response_model=ConversationStatusResponse)
 async def get_conversation_status(
     conversation_id: UUID,
@@ -87,12 +196,12 @@ async def get_structured_data(
         result = supabase.table("conversations").select(
             "id, structured_data, recording_url, duration_ms"
         ).eq("id", str(conversation_id)).execute()
+        conv = result.data[0] if result.data else await ConversationService().get_archived_conversation(conversation_id)
         
-        if not result.data:
+        if conv is None:
             logger.warning(f"Conversation not found: {conversation_id}")
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        conv = result.data[0]
         return StructuredDataResponse(
             conversation_id=conv["id"],
             structured_data=conv.get("structured_data"),
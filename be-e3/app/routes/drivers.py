@@ -1,10 +1,14 @@
+import csv
+import io
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from typing import List
 from uuid import UUID
-from app.models.driver import DriverCreate, DriverUpdate, DriverResponse
-from app.services.driver_service import DriverService
+from app.models.driver import DriverCreate, DriverUpdate, DriverResponse, DriverImportResponse, DriverSearchResult
+from app.services.driver_service import DriverService, DRIVER_LIST_ADAPTER, DRIVER_SEARCH_ADAPTER
 from app.dependencies import verify_api_key
+from app.responses import ValidatedJSONResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/drivers", tags=["drivers"])
@@ -29,12 +33,54 @@ async def create_driver(
             detail=f"Failed to create driver: {str(e)}"
         )
 
+@router.post("/import", response_model=DriverImportResponse)
+async def import_drivers(
+    request: Request,
+    _: str = Depends(verify_api_key)
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    logger.info(f"API request to import drivers from {content_type or 'unknown content type'}")
+    
+    body = await request.body()
+    try:
+        if content_type == "text/csv":
+            rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+        elif content_type == "application/json":
+            payload = json.loads(body)
+            rows = payload.get("drivers", []) if isinstance(payload, dict) else payload
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise ValueError("Expected a list of drivers")
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Send drivers as text/csv or application/json"
+            )
+    except HTTPException:
+        raise
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid driver import payload: {str(e)}"
+        )
+    
+    try:
+        service = DriverService()
+        return await service.import_drivers(rows)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in import_drivers endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import drivers: {str(e)}"
+        )
+
 @router.get("/", response_model=List[DriverResponse])
 async def list_drivers(_: str = Depends(verify_api_key)):
     logger.debug("API request to list drivers")
     try:
         service = DriverService()
-        return await service.list_drivers()
+        return ValidatedJSONResponse(await service.list_drivers(), DRIVER_LIST_ADAPTER)
     except Exception as e:
         logger.error(f"Error in list_drivers endpoint: {e}")
         raise HTTPException(
@@ -42,6 +88,23 @@ async def list_drivers(_: str = Depends(verify_api_key)):
             detail=f"Failed to list drivers: {str(e)}"
         )
 
+@router.get("/search", response_model=List[DriverSearchResult])
+async def search_drivers(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    _: str = Depends(verify_api_key)
+):
+    logger.debug(f"API request to search drivers: {q}")
+    try:
+        service = DriverService()
+        return ValidatedJSONResponse(await service.search_drivers(q, limit), DRIVER_SEARCH_ADAPTER)
+    except Exception as e:
+        logger.error(f"Error in search_drivers endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search drivers: {str(e)}"
+        )
+
 @router.get("/{driver_id}", response_model=DriverResponse)
 async def get_driver(
     driver_id: UUID,
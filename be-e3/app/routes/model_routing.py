@@ -0,0 +1,12 @@
+import logging
+from fastapi import APIRouter, Depends
+from app.services.model_router import get_model_router
+from app.dependencies import verify_api_key
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/model-routing", tags=["model-routing"])
+
+@router.get("/stats")
+async def get_model_routing_stats(_: str = Depends(verify_api_key)):
+    logger.debug("API request to get model routing stats")
+    return get_model_router().snapshot()
@@ -0,0 +1,24 @@
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.services.sweeper_service import get_conversation_sweeper
+from app.dependencies import verify_api_key
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api/sweeper", tags=["sweeper"])
+
+@router.get("/status")
+async def get_sweeper_status(_: str = Depends(verify_api_key)):
+    logger.debug("API request to get sweeper status")
+    return get_conversation_sweeper().stats
+
+@router.post("/run")
+async def run_sweeper(_: str = Depends(verify_api_key)):
+    logger.info("API request to run sweeper")
+    try:
+        return await get_conversation_sweeper().sweep_once()
+    except Exception as e:
+        logger.error(f"Error in run_sweeper endpoint: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to run sweeper: {str(e)}"
+        )
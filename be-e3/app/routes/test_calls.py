@@ -46,7 +46,7 @@ async def start_test_call(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Either driver_id or both driver_name and driver_phone must be provided"
                 )
-            driver = await driver_service.create_driver(
+            driver = await driver_service.get_or_create_driver(
                 DriverCreate(name=request.driver_name, phone_number=request.driver_phone)
             )
         
@@ -103,7 +103,7 @@ async def end_test_call(conversation_id: UUID):
     try:
         supabase = get_supabase()
         
-        conversation_result = supabase.table("conversations").select("*").eq(
+        conversation_result = supabase.table("conversations").select("id, retell_call_id").eq(
             "id", str(conversation_id)
         ).execute()
         
@@ -121,19 +121,22 @@ async def end_test_call(conversation_id: UUID):
             logger.info(f"Ending call with Retell call ID: {retell_call_id}")
             await asyncio.sleep(2)
             
+            webhook_service = WebhookService()
             try:
-                webhook_service = WebhookService()
-                await webhook_service.handle_call_ended({"call_id": retell_call_id})
+                await webhook_service.dispatch_call_ended({"call_id": retell_call_id})
             except Exception as e:
-                logger.error(f"Error processing call end via webhook: {e}")
-                supabase.table("conversations").update({
-                    "status": ConversationStatus.COMPLETED.value
-                }).eq("id", str(conversation_id)).execute()
+                logger.error(f"Error processing call end via webhook, queueing a retry: {e}")
+                try:
+                    webhook_service.enqueue_call_ended({"call_id": retell_call_id})
+                except Exception as enqueue_error:
+                    logger.error(f"Failed to queue call end retry, leaving it to the sweeper: {enqueue_error}")
         else:
             logger.info(f"No Retell call ID found, marking conversation as completed: {conversation_id}")
-            supabase.table("conversations").update({
-                "status": ConversationStatus.COMPLETED.value
-            }).eq("id", str(conversation_id)).execute()
+            await ConversationService().transition_status(
+                conversation_id,
+                ConversationStatus.COMPLETED,
+                from_statuses=[ConversationStatus.PENDING, ConversationStatus.IN_PROGRESS]
+            )
         
         logger.info(f"Successfully ended test call: {conversation_id}")
         return {"status": "success", "message": "Call ended and processing initiated"}
@@ -1,15 +1,21 @@
+import asyncio
 import logging
-from typing import List
+from typing import Callable, Dict, List, Optional
 from uuid import UUID
-from datetime import datetime
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from app.config import settings
 from app.database.client import get_supabase
-from app.models.agent import AgentCreate, AgentUpdate, AgentResponse, AgentListResponse
+from app.models.agent import AgentCreate, AgentUpdate, AgentResponse, AgentListResponse, AgentBulkItemResult, AgentBulkCreateResponse
+from app.services.extraction_schema import DEFAULT_EXTRACTION_SCHEMA, build_extraction_schema
+from app.services.last_used_buffer import get_last_used_buffer
 from app.services.prompt_generation_service import PromptGenerationService
 from app.services.retell_service import RetellService
 
 logger = logging.getLogger(__name__)
 
+AGENT_LIST_ADAPTER = TypeAdapter(List[AgentListResponse])
+
 class AgentService:
     def __init__(self):
         self.supabase = get_supabase()
@@ -21,9 +27,12 @@ class AgentService:
         scenario_desc = agent.scenario_description or agent.prompts
         
         try:
-            system_prompt = await self.prompt_service.generate_system_prompt(
-                scenario_description=scenario_desc,
-                additional_context=agent.additional_details
+            system_prompt, extraction_schema = await asyncio.gather(
+                self.prompt_service.generate_system_prompt(
+                    scenario_description=scenario_desc,
+                    additional_context=agent.additional_details
+                ),
+                self._generate_extraction_schema(scenario_desc, agent.additional_details)
             )
             logger.info(f"Generated system prompt for agent: {agent.name}")
         except Exception as e:
@@ -46,14 +55,9 @@ class AgentService:
                 detail=f"Failed to create Retell agent: {str(e)}"
             )
         
-        result = self.supabase.table("agents").insert({
-            "name": agent.name,
-            "prompts": agent.prompts,
-            "additional_details": agent.additional_details,
-            "scenario_description": scenario_desc,
-            "system_prompt": system_prompt,
-            "retell_agent_id": retell_agent["agent_id"]
-        }).execute()
+        result = self.supabase.table("agents").insert(
+            self._build_agent_row(agent, scenario_desc, system_prompt, extraction_schema, retell_agent["agent_id"])
+        ).execute()
         
         if not result.data:
             logger.error(f"Failed to insert agent into database: {agent.name}")
@@ -65,6 +69,135 @@ class AgentService:
         logger.info(f"Successfully created agent: {result.data[0]['id']}")
         return AgentResponse(**result.data[0])
     
+    async def bulk_create_agents(
+        self,
+        agents: List[AgentCreate],
+        prompt_concurrency: Optional[int] = None,
+        retell_concurrency: Optional[int] = None,
+        on_progress: Optional[Callable[[AgentBulkItemResult], None]] = None
+    ) -> AgentBulkCreateResponse:
+        logger.info(f"Bulk creating {len(agents)} agents")
+        prompt_semaphore = asyncio.Semaphore(prompt_concurrency or settings.bulk_prompt_concurrency)
+        retell_semaphore = asyncio.Semaphore(retell_concurrency or settings.bulk_retell_concurrency)
+        results: Dict[int, AgentBulkItemResult] = {}
+
+        def report(index: int, result: AgentBulkItemResult) -> None:
+            results[index] = result
+            logger.info(f"Bulk agent {len(results)}/{len(agents)} {result.status}: {result.name}")
+            if on_progress:
+                on_progress(result)
+
+        existing_by_name = {}
+        names = list({agent.name for agent in agents})
+        if names:
+            existing = self.supabase.table("agents").select("id, name, retell_agent_id").in_("name", names).execute()
+            existing_by_name = {row["name"]: row for row in existing.data if row.get("retell_agent_id")}
+
+        pending = []
+        seen_names = set()
+        for index, agent in enumerate(agents):
+            if agent.name in seen_names:
+                report(index, AgentBulkItemResult(name=agent.name, status="failed", error="Duplicate agent name in manifest"))
+            elif agent.name in existing_by_name:
+                row = existing_by_name[agent.name]
+                report(index, AgentBulkItemResult(
+                    name=agent.name,
+                    status="skipped",
+                    agent_id=row["id"],
+                    retell_agent_id=row["retell_agent_id"]
+                ))
+            else:
+                pending.append((index, agent))
+            seen_names.add(agent.name)
+
+        llm_ids: Dict[str, str] = {}
+
+        async def provision(index: int, agent: AgentCreate) -> Optional[Dict]:
+            scenario_desc = agent.scenario_description or agent.prompts
+            try:
+                async with prompt_semaphore:
+                    system_prompt, extraction_schema = await asyncio.gather(
+                        self.prompt_service.generate_system_prompt(
+                            scenario_description=scenario_desc,
+                            additional_context=agent.additional_details
+                        ),
+                        self._generate_extraction_schema(scenario_desc, agent.additional_details)
+                    )
+            except Exception as e:
+                logger.error(f"Failed to generate system prompt for {agent.name}: {e}")
+                report(index, AgentBulkItemResult(name=agent.name, status="failed", error=f"Failed to generate system prompt: {str(e)}"))
+                return None
+
+            try:
+                async with retell_semaphore:
+                    retell_agent = await self.retell_service.create_agent(
+                        name=agent.name,
+                        system_prompt=system_prompt
+                    )
+            except Exception as e:
+                logger.error(f"Failed to create Retell agent for {agent.name}: {e}")
+                report(index, AgentBulkItemResult(name=agent.name, status="failed", error=f"Failed to create Retell agent: {str(e)}"))
+                return None
+
+            llm_ids[retell_agent["agent_id"]] = retell_agent["llm_id"]
+            return self._build_agent_row(agent, scenario_desc, system_prompt, extraction_schema, retell_agent["agent_id"])
+
+        async def discard(retell_agent_id: str) -> bool:
+            try:
+                async with retell_semaphore:
+                    await self.retell_service.delete_agent(retell_agent_id, llm_ids.get(retell_agent_id))
+                return True
+            except Exception as e:
+                logger.error(f"Failed to clean up Retell agent {retell_agent_id}: {e}")
+                return False
+
+        rows = await asyncio.gather(*(provision(index, agent) for index, agent in pending))
+        provisioned = [(index, row) for (index, _), row in zip(pending, rows) if row is not None]
+
+        batch_size = max(settings.bulk_insert_batch_size, 1)
+        for start in range(0, len(provisioned), batch_size):
+            batch = provisioned[start:start + batch_size]
+            try:
+                result = self.supabase.table("agents").insert([row for _, row in batch]).execute()
+                inserted_by_retell_id = {row["retell_agent_id"]: row for row in result.data}
+            except Exception as e:
+                logger.error(f"Failed to insert agent batch, deleting its Retell agents: {e}")
+                inserted_by_retell_id = {}
+                insert_error = str(e)
+                deleted = await asyncio.gather(*(discard(row["retell_agent_id"]) for _, row in batch))
+                discarded = {row["retell_agent_id"] for (_, row), ok in zip(batch, deleted) if ok}
+            else:
+                insert_error = "Agent was not returned by the database insert"
+                discarded = set()
+
+            for index, row in batch:
+                inserted = inserted_by_retell_id.get(row["retell_agent_id"])
+                if inserted:
+                    report(index, AgentBulkItemResult(
+                        name=row["name"],
+                        status="created",
+                        agent_id=inserted["id"],
+                        retell_agent_id=row["retell_agent_id"]
+                    ))
+                else:
+                    report(index, AgentBulkItemResult(
+                        name=row["name"],
+                        status="failed",
+                        retell_agent_id=None if row["retell_agent_id"] in discarded else row["retell_agent_id"],
+                        error=f"Failed to insert agent: {insert_error}"
+                    ))
+
+        ordered = [results[index] for index in range(len(agents))]
+        response = AgentBulkCreateResponse(
+            total=len(ordered),
+            created=sum(1 for r in ordered if r.status == "created"),
+            skipped=sum(1 for r in ordered if r.status == "skipped"),
+            failed=sum(1 for r in ordered if r.status == "failed"),
+            results=ordered
+        )
+        logger.info(f"Bulk agent creation finished: {response.created} created, {response.skipped} skipped, {response.failed} failed")
+        return response
+    
     async def get_agent(self, agent_id: UUID) -> AgentResponse:
         logger.debug(f"Fetching agent: {agent_id}")
         result = self.supabase.table("agents").select("*").eq("id", str(agent_id)).execute()
@@ -79,22 +212,15 @@ class AgentService:
         return AgentResponse(**result.data[0])
     
     async def list_agents(self) -> List[AgentListResponse]:
-        agents_result = self.supabase.table("agents").select("*").execute()
+        agents_result = self.supabase.table("agents").select(
+            "id, name, created_at, last_used_at, conversations(count)"
+        ).execute()
         
-        agents_list = []
         for agent in agents_result.data:
-            conv_result = self.supabase.table("conversations").select("id", count="exact").eq("agent_id", agent["id"]).execute()
-            conversation_count = conv_result.count if conv_result.count else 0
-            
-            agents_list.append(AgentListResponse(
-                id=agent["id"],
-                name=agent["name"],
-                created_at=agent["created_at"],
-                last_used_at=agent.get("last_used_at"),
-                conversation_count=conversation_count
-            ))
-        
-        return agents_list
+            counts = agent.pop("conversations", None) or [{"count": 0}]
+            agent["conversation_count"] = counts[0]["count"]
+        
+        return AGENT_LIST_ADAPTER.validate_python(agents_result.data)
     
     async def update_agent(self, agent_id: UUID, agent: AgentUpdate) -> AgentResponse:
         logger.info(f"Updating agent: {agent_id}")
@@ -114,9 +240,12 @@ class AgentService:
             additional_details = update_data.get('additional_details', current_agent.additional_details)
             
             try:
-                system_prompt = await self.prompt_service.generate_system_prompt(
-                    scenario_description=scenario_desc,
-                    additional_context=additional_details
+                system_prompt, extraction_schema = await asyncio.gather(
+                    self.prompt_service.generate_system_prompt(
+                        scenario_description=scenario_desc,
+                        additional_context=additional_details
+                    ),
+                    self._generate_extraction_schema(scenario_desc, additional_details)
                 )
                 logger.info(f"Regenerated system prompt for agent: {agent_id}")
             except Exception as e:
@@ -138,6 +267,7 @@ class AgentService:
                     logger.error(f"Error updating Retell agent: {e}")
             
             update_data['system_prompt'] = system_prompt
+            update_data['extraction_schema'] = extraction_schema
             update_data['scenario_description'] = scenario_desc
         
         result = self.supabase.table("agents").update(update_data).eq("id", str(agent_id)).execute()
@@ -166,7 +296,47 @@ class AgentService:
         logger.info(f"Successfully deleted agent: {agent_id}")
     
     async def update_last_used(self, agent_id: UUID) -> None:
-        self.supabase.table("agents").update({
-            "last_used_at": datetime.utcnow().isoformat()
-        }).eq("id", str(agent_id)).execute()
-
+        get_last_used_buffer().touch(agent_id)
+    
+    async def ensure_extraction_schema(self, agent: Dict) -> Dict:
+        if agent.get("extraction_schema"):
+            return agent["extraction_schema"]
+        
+        logger.info(f"Generating missing extraction schema for agent: {agent['id']}")
+        extraction_schema = await self._generate_extraction_schema(
+            agent.get("scenario_description") or agent.get("prompts") or "",
+            agent.get("additional_details")
+        )
+        if extraction_schema is None:
+            logger.warning(f"Storing default extraction schema for agent: {agent['id']}")
+            extraction_schema = DEFAULT_EXTRACTION_SCHEMA
+        
+        try:
+            self.supabase.table("agents").update({"extraction_schema": extraction_schema}).eq(
+                "id", str(agent["id"])
+            ).is_("extraction_schema", "null").execute()
+        except Exception as e:
+            logger.error(f"Failed to store extraction schema for agent {agent['id']}: {e}")
+        return extraction_schema
+    
+    async def _generate_extraction_schema(self, scenario_desc: str, additional_details: Optional[str]) -> Optional[Dict]:
+        try:
+            fields = await self.prompt_service.generate_extraction_fields(
+                scenario_description=scenario_desc,
+                additional_context=additional_details
+            )
+        except Exception as e:
+            logger.warning(f"Extraction schema generation failed, it will be retried on first extraction: {e}")
+            return None
+        return build_extraction_schema(fields)
+    
+    def _build_agent_row(self, agent: AgentCreate, scenario_desc: str, system_prompt: str, extraction_schema: Optional[Dict], retell_agent_id: str) -> Dict:
+        return {
+            "name": agent.name,
+            "prompts": agent.prompts,
+            "additional_details": agent.additional_details,
+            "scenario_description": scenario_desc,
+            "system_prompt": system_prompt,
+            "extraction_schema": extraction_schema,
+            "retell_agent_id": retell_agent_id
+        }
@@ -0,0 +1,72 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+from app.database.client import get_supabase
+from app.models.analytics import AnalyticsBucket, AnalyticsGroupBy, AnalyticsResponse
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ["calls", "completed", "failed", "emergencies", "duration_ms_sum", "duration_count", "extraction_attempts", "extraction_successes"]
+
+def _ratio(numerator: int, denominator: int, digits: int = 4) -> Optional[float]:
+    return round(numerator / denominator, digits) if denominator else None
+
+def _bucket(key: str, label: str, row: Dict) -> AnalyticsBucket:
+    return AnalyticsBucket(
+        key=key,
+        label=label,
+        calls=row["calls"],
+        completed=row["completed"],
+        failed=row["failed"],
+        emergencies=row["emergencies"],
+        emergency_rate=_ratio(row["emergencies"], row["calls"]),
+        avg_duration_ms=_ratio(row["duration_ms_sum"], row["duration_count"], 1),
+        extraction_success_rate=_ratio(row["extraction_successes"], row["extraction_attempts"]),
+        outcomes=row["outcomes"] or {}
+    )
+
+class AnalyticsService:
+    def __init__(self):
+        self.supabase = get_supabase()
+    
+    def record_conversation(self, conversation_id: UUID) -> None:
+        try:
+            result = self.supabase.rpc("record_conversation_rollup", {"p_conversation_id": str(conversation_id)}).execute()
+            if result.data:
+                logger.debug(f"Recorded conversation in analytics rollups: {conversation_id}")
+        except Exception as e:
+            logger.error(f"Failed to record analytics rollup for conversation {conversation_id}: {e}")
+    
+    async def get_rollup(
+        self,
+        start: datetime,
+        end: datetime,
+        group_by: AnalyticsGroupBy,
+        agent_id: Optional[UUID] = None,
+        driver_id: Optional[UUID] = None
+    ) -> AnalyticsResponse:
+        result = self.supabase.rpc("analytics_rollup", {
+            "p_start": start.isoformat(),
+            "p_end": end.isoformat(),
+            "p_group_by": group_by.value,
+            "p_agent_id": str(agent_id) if agent_id else None,
+            "p_driver_id": str(driver_id) if driver_id else None
+        }).execute()
+        rows: List[Dict] = result.data or []
+        
+        totals = {field: sum(row[field] for row in rows) for field in COUNTER_FIELDS}
+        totals["outcomes"] = {}
+        for row in rows:
+            for outcome, count in (row["outcomes"] or {}).items():
+                totals["outcomes"][outcome] = totals["outcomes"].get(outcome, 0) + count
+        
+        return AnalyticsResponse(
+            start=start,
+            end=end,
+            group_by=group_by,
+            agent_id=agent_id,
+            driver_id=driver_id,
+            totals=_bucket("total", "Total", totals),
+            buckets=[_bucket(row["group_key"], row["group_label"], row) for row in rows]
+        )
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict
+from app.config import settings
+from app.database.client import get_supabase
+from app.services.lease_service import LeaseService
+
+logger = logging.getLogger(__name__)
+
+ARCHIVER_LEASE_KEY = "archiver"
+
+class ConversationArchiver:
+    def __init__(self):
+        self.supabase = get_supabase()
+        self.lease_service = LeaseService()
+        self.stats: Dict = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_duration_ms": None,
+            "last_cutoff": None,
+            "last_archived": 0,
+            "archived_total": 0
+        }
+    
+    async def run(self) -> None:
+        logger.info(f"Starting conversation archiver every {settings.archive_interval_seconds}s for conversations older than {settings.archive_after_days} days")
+        lease_ttl = int(settings.archive_interval_seconds * 2) + 1
+        while True:
+            try:
+                if await self.lease_service.try_acquire(ARCHIVER_LEASE_KEY, lease_ttl):
+                    await self.archive_once()
+                else:
+                    logger.debug("Archiver lease is held by another replica, skipping run")
+            except Exception as e:
+                logger.error(f"Error archiving conversations: {e}")
+            await asyncio.sleep(settings.archive_interval_seconds)
+    
+    async def archive_once(self) -> Dict:
+        started = time.monotonic()
+        cutoff = datetime.utcnow() - timedelta(days=settings.archive_after_days)
+        archived = 0
+        
+        while True:
+            query = self.supabase.rpc("archive_conversations", {
+                "p_before": cutoff.isoformat(),
+                "p_limit": settings.archive_batch_size
+            })
+            result = await asyncio.to_thread(query.execute)
+            batch = result.data or 0
+            archived += batch
+            if batch < settings.archive_batch_size:
+                break
+        
+        self.stats["runs"] += 1
+        self.stats["last_run_at"] = datetime.utcnow().isoformat()
+        self.stats["last_duration_ms"] = int((time.monotonic() - started) * 1000)
+        self.stats["last_cutoff"] = cutoff.isoformat()
+        self.stats["last_archived"] = archived
+        self.stats["archived_total"] += archived
+        
+        if archived:
+            logger.info(f"Archived {archived} conversations started before {cutoff.isoformat()}")
+        return {"archived": archived, "cutoff": cutoff.isoformat()}
+
+_archiver: ConversationArchiver = None
+
+def get_conversation_archiver() -> ConversationArchiver:
+    global _archiver
+    if _archiver is None:
+        _archiver = ConversationArchiver()
+    return _archiver
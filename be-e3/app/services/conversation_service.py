@@ -1,17 +1,59 @@
+import asyncio
 import logging
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from app.config import settings
 from app.database.client import get_supabase
-from app.models.conversation import ConversationCreate, ConversationResponse, ConversationListResponse, ConversationStatusResponse, ConversationStatus
+from app.models.conversation import ConversationCreate, ConversationResponse, ConversationListResponse, ConversationStatusResponse, ConversationStatus, ConversationDetailResponse, ConversationSearchResponse, ConversationSearchResult, ConversationListFilters
+from app.services.analytics_service import AnalyticsService
+from app.services.extracted_fields import EXTRACTED_FIELDS_BY_NAME, EXTRACTED_FIELD_NAMES
+from app.services.transcript_store import utterance_created_at, utterance_message
 from app.models.message import MessageCreate, MessageResponse
 
 logger = logging.getLogger(__name__)
 
+CONVERSATION_COLUMNS = "id, agent_id, driver_id, load_number, status, started_at, completed_at, retell_call_id, retell_access_token, recording_url, transcript, duration_ms, structured_data, emergency_detected"
+MESSAGE_COLUMNS = "id, conversation_id, seq, role, content, created_at"
+DETAIL_BASE_COLUMNS = "id, agent_id, driver_id, load_number, status, started_at, completed_at, retell_call_id, retell_access_token, recording_url, duration_ms, emergency_detected"
+DETAIL_INCLUDE_FIELDS = {"agent", "driver", "transcript", "structured_data", "messages"}
+
+ALLOWED_TRANSITIONS = {
+    ConversationStatus.PENDING: {ConversationStatus.IN_PROGRESS, ConversationStatus.PROCESSING, ConversationStatus.COMPLETED, ConversationStatus.FAILED},
+    ConversationStatus.IN_PROGRESS: {ConversationStatus.PROCESSING, ConversationStatus.COMPLETED, ConversationStatus.FAILED},
+    ConversationStatus.PROCESSING: {ConversationStatus.IN_PROGRESS, ConversationStatus.COMPLETED, ConversationStatus.FAILED},
+    ConversationStatus.COMPLETED: set(),
+    ConversationStatus.FAILED: set()
+}
+
+CONVERSATION_LIST_ADAPTER = TypeAdapter(List[ConversationListResponse])
+MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageResponse])
+
+def apply_conversation_filters(query, filters: ConversationListFilters):
+    if filters.status:
+        query = query.eq("status", filters.status.value)
+    for field in ("call_outcome", "emergency_type"):
+        value = getattr(filters, field)
+        if value:
+            query = query.eq(field, EXTRACTED_FIELDS_BY_NAME[field].coerce(value))
+    if filters.customer:
+        query = query.eq("customer", filters.customer)
+    if filters.is_load_secure is not None:
+        query = query.is_("is_load_secure", str(filters.is_load_secure).lower())
+    if filters.emergency_detected is not None:
+        query = query.is_("emergency_detected", str(filters.emergency_detected).lower())
+    if filters.started_after:
+        query = query.gte("started_at", filters.started_after.isoformat())
+    if filters.started_before:
+        query = query.lt("started_at", filters.started_before.isoformat())
+    return query
+
 class ConversationService:
     def __init__(self):
         self.supabase = get_supabase()
+        self.analytics_service = AnalyticsService()
     
     async def create_conversation(self, conversation: ConversationCreate) -> ConversationResponse:
         logger.info(f"Creating conversation for agent: {conversation.agent_id}, driver: {conversation.driver_id}")
@@ -43,74 +85,294 @@ class ConversationService:
             )
     
     async def get_conversation(self, conversation_id: UUID) -> ConversationResponse:
-        result = self.supabase.table("conversations").select("*").eq("id", str(conversation_id)).execute()
+        result = self.supabase.table("conversations").select(CONVERSATION_COLUMNS).eq("id", str(conversation_id)).execute()
+        conv = result.data[0] if result.data else await self.get_archived_conversation(conversation_id)
+        
+        if conv is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
+            )
+        
+        return ConversationResponse(**conv)
+    
+    async def get_conversation_detail(self, conversation_id: UUID, include: Set[str] = DETAIL_INCLUDE_FIELDS) -> ConversationDetailResponse:
+        columns = [DETAIL_BASE_COLUMNS]
+        if "transcript" in include:
+            columns.append("transcript")
+        if "structured_data" in include:
+            columns.append("structured_data")
+        if "agent" in include:
+            columns.append("agents(name)")
+        if "driver" in include:
+            columns.append("drivers(name)")
+        if "messages" in include:
+            columns.append(f"messages({MESSAGE_COLUMNS})")
+        
+        query = self.supabase.table("conversations").select(", ".join(columns)).eq("id", str(conversation_id))
+        if "messages" in include:
+            query = query.order("seq", foreign_table="messages")
+        result = query.execute()
         
         if not result.data:
+            return await self._archived_detail(conversation_id, include)
+        
+        conv = result.data[0]
+        agent = conv.pop("agents", None)
+        driver = conv.pop("drivers", None)
+        if "agent" in include:
+            conv["agent_name"] = agent["name"] if agent else None
+        if "driver" in include:
+            conv["driver_name"] = driver["name"] if driver else None
+        
+        if "messages" in include and not conv.get("messages"):
+            conv["messages"] = await self._compact_message_rows(conversation_id)
+        
+        return ConversationDetailResponse(**conv)
+    
+    async def _archived_detail(self, conversation_id: UUID, include: Set[str]) -> ConversationDetailResponse:
+        archived = await self.get_archived_conversation(conversation_id, with_messages="messages" in include)
+        if archived is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation not found"
             )
         
-        return ConversationResponse(**result.data[0])
+        fields = DETAIL_BASE_COLUMNS.split(", ") + [field for field in ("transcript", "structured_data", "messages") if field in include]
+        if "agent" in include:
+            fields.append("agent_name")
+        if "driver" in include:
+            fields.append("driver_name")
+        return ConversationDetailResponse(**{field: archived.get(field) for field in fields})
     
-    async def list_conversations(self) -> List[ConversationListResponse]:
-        result = self.supabase.table("conversations").select(
-            "*, agents(name), drivers(name)"
-        ).execute()
+    async def get_archived_conversation(self, conversation_id: UUID, with_messages: bool = False) -> Optional[Dict]:
+        columns = "record, agents(name), drivers(name)"
+        if with_messages:
+            columns += ", messages"
+        query = self.supabase.table("conversation_archive").select(columns).eq("id", str(conversation_id)).limit(1)
+        result = await asyncio.to_thread(query.execute)
+        if not result.data:
+            return None
+        
+        row = result.data[0]
+        conv = row["record"]
+        conv["agent_name"] = (row.get("agents") or {}).get("name")
+        conv["driver_name"] = (row.get("drivers") or {}).get("name")
+        if with_messages:
+            conv["messages"] = self._archived_messages(conversation_id, row["messages"], conv)
+        return conv
+    
+    def _archived_messages(self, conversation_id: UUID, messages: Optional[List[Dict]], conv: Dict, include_words: bool = False) -> List[Dict]:
+        if not messages:
+            return self._archived_utterances(conversation_id, conv, include_words)
+        return [{**message, "conversation_id": conversation_id} for message in messages]
+    
+    def _archived_utterances(self, conversation_id: UUID, conv: Dict, include_words: bool = False) -> List[Dict]:
+        rows = []
+        for seq, utterance in enumerate(conv.get("transcript_utterances") or []):
+            row = {**utterance, "seq": seq, "created_at": utterance_created_at(conv["started_at"], utterance.get("start_ms"))}
+            rows.append(utterance_message(conversation_id, row, include_words))
+        return rows
+    
+    async def list_conversations(self, filters: Optional[ConversationListFilters] = None) -> List[ConversationListResponse]:
+        query = self.supabase.table("conversations").select(
+            f"id, agent_id, driver_id, load_number, status, started_at, completed_at, emergency_detected, {', '.join(EXTRACTED_FIELD_NAMES)}, agents(name), drivers(name)"
+        )
+        if filters:
+            query = apply_conversation_filters(query, filters)
+        
+        result = query.execute()
         
-        conversations = []
         for conv in result.data:
-            conversations.append(ConversationListResponse(
-                id=conv["id"],
-                agent_id=conv["agent_id"],
-                agent_name=conv["agents"]["name"],
-                driver_id=conv["driver_id"],
-                driver_name=conv["drivers"]["name"],
-                load_number=conv["load_number"],
-                status=conv["status"],
-                started_at=conv["started_at"],
-                completed_at=conv.get("completed_at")
-            ))
-        
-        return conversations
-    
-    async def get_conversation_messages(self, conversation_id: UUID) -> List[MessageResponse]:
-        result = self.supabase.table("messages").select("*").eq(
-            "conversation_id", str(conversation_id)
-        ).order("created_at").execute()
+            conv["agent_name"] = conv.pop("agents")["name"]
+            conv["driver_name"] = conv.pop("drivers")["name"]
+        
+        return CONVERSATION_LIST_ADAPTER.validate_python(result.data)
+    
+    async def search_conversations(self, query: str, limit: int, offset: int) -> ConversationSearchResponse:
+        result = self.supabase.rpc("search_conversations", {
+            "p_query": query,
+            "p_limit": limit,
+            "p_offset": offset
+        }).execute()
+        
+        rows = result.data or []
+        return ConversationSearchResponse(
+            query=query,
+            total=rows[0]["total"] if rows else 0,
+            limit=limit,
+            offset=offset,
+            results=[ConversationSearchResult(**row) for row in rows]
+        )
+    
+    async def get_conversation_messages(
+        self,
+        conversation_id: UUID,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        include_words: bool = False
+    ) -> List[MessageResponse]:
+        rows, _ = await self._message_rows(conversation_id, after, limit, include_words)
+        return MESSAGE_LIST_ADAPTER.validate_python(rows)
+    
+    async def iter_message_pages(
+        self,
+        conversation_id: UUID,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        include_words: bool = False
+    ) -> AsyncIterator[List[Dict]]:
+        source = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            page_size = settings.message_page_size if remaining is None else min(remaining, settings.message_page_size)
+            rows, source = await self._message_rows(conversation_id, after, page_size, include_words, source)
+            if rows:
+                yield rows
+            if len(rows) < page_size:
+                return
+            after = rows[-1]["seq"]
+            if remaining is not None:
+                remaining -= len(rows)
+    
+    async def _message_rows(
+        self,
+        conversation_id: UUID,
+        after: Optional[int],
+        limit: Optional[int],
+        include_words: bool,
+        source: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        sources = ["compact", "messages"] if settings.transcript_storage_mode == "compact" else ["messages", "compact"]
+        for candidate in [source] if source else sources + ["archive"]:
+            if candidate == "compact":
+                rows = await self._compact_message_rows(conversation_id, after, limit, include_words)
+            elif candidate == "archive":
+                rows = await self._archived_message_rows(conversation_id, after, limit, include_words)
+            else:
+                rows = await self._stored_message_rows(conversation_id, after, limit)
+            if rows:
+                return rows, candidate
+        return [], source
+    
+    async def _stored_message_rows(self, conversation_id: UUID, after: Optional[int], limit: Optional[int]) -> List[Dict]:
+        query = self.supabase.table("messages").select(MESSAGE_COLUMNS).eq("conversation_id", str(conversation_id))
+        if after is not None:
+            query = query.gt("seq", after)
+        query = query.order("seq")
+        if limit is not None:
+            query = query.limit(limit)
+        result = await asyncio.to_thread(query.execute)
+        return result.data or []
+    
+    async def _compact_message_rows(
+        self,
+        conversation_id: UUID,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        include_words: bool = False
+    ) -> List[Dict]:
+        query = self.supabase.rpc("conversation_utterances", {
+            "p_conversation_id": str(conversation_id),
+            "p_offset": after + 1 if after is not None else 0,
+            "p_limit": limit,
+            "p_include_words": include_words
+        })
+        result = await asyncio.to_thread(query.execute)
+        return [utterance_message(conversation_id, row, include_words) for row in result.data or []]
+    
+    async def _archived_message_rows(
+        self,
+        conversation_id: UUID,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        include_words: bool = False
+    ) -> List[Dict]:
+        query = self.supabase.table("conversation_archive").select(
+            "messages, started_at, transcript_utterances:record->transcript_utterances"
+        ).eq("id", str(conversation_id)).limit(1)
+        result = await asyncio.to_thread(query.execute)
+        if not result.data:
+            return []
         
-        return [MessageResponse(**msg) for msg in result.data]
+        archived = result.data[0]
+        rows = self._archived_messages(conversation_id, archived["messages"], archived, include_words)
+        if after is not None:
+            rows = [row for row in rows if row["seq"] > after]
+        return rows[:limit] if limit is not None else rows
     
     async def get_conversation_status(self, conversation_id: UUID) -> ConversationStatusResponse:
         result = self.supabase.table("conversations").select(
-            "id, status, completed_at"
+            "id, status, completed_at, emergency_detected"
         ).eq("id", str(conversation_id)).execute()
+        conv = result.data[0] if result.data else await self.get_archived_conversation(conversation_id)
         
-        if not result.data:
+        if conv is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation not found"
             )
         
-        return ConversationStatusResponse(**result.data[0])
+        return ConversationStatusResponse(**conv)
     
-    async def update_conversation_status(self, conversation_id: UUID, new_status: ConversationStatus) -> None:
-        update_data = {"status": new_status.value}
+    async def update_conversation_status(self, conversation_id: UUID, new_status: ConversationStatus) -> bool:
+        return await self.transition_status(conversation_id, new_status) is not None
+    
+    async def transition_status(
+        self,
+        conversation_id: UUID,
+        new_status: ConversationStatus,
+        from_statuses: Optional[List[ConversationStatus]] = None,
+        extra: Optional[Dict] = None,
+        reclaim_processing_after_seconds: Optional[int] = None
+    ) -> Optional[Dict]:
+        if from_statuses is None:
+            from_statuses = [current for current, targets in ALLOWED_TRANSITIONS.items() if new_status in targets]
         
+        now = datetime.utcnow()
+        update_data = {**(extra or {}), "status": new_status.value, "status_updated_at": now.isoformat()}
         if new_status in [ConversationStatus.COMPLETED, ConversationStatus.FAILED]:
-            update_data["completed_at"] = datetime.utcnow().isoformat()
+            update_data["completed_at"] = now.isoformat()
+        
+        query = self.supabase.table("conversations").update(update_data).eq("id", str(conversation_id))
+        allowed = ",".join(current.value for current in from_statuses)
+        if reclaim_processing_after_seconds is not None:
+            stale_before = (now - timedelta(seconds=reclaim_processing_after_seconds)).isoformat()
+            query = query.or_(
+                f"status.in.({allowed}),and(status.eq.{ConversationStatus.PROCESSING.value},status_updated_at.lt.{stale_before})"
+            )
+        else:
+            query = query.in_("status", [current.value for current in from_statuses])
+        result = query.execute()
         
-        self.supabase.table("conversations").update(update_data).eq("id", str(conversation_id)).execute()
+        if not result.data:
+            logger.info(f"Status transition to {new_status.value} not applied for conversation: {conversation_id}")
+            return None
+        
+        if new_status in [ConversationStatus.COMPLETED, ConversationStatus.FAILED]:
+            self.analytics_service.record_conversation(conversation_id)
+        
+        return result.data[0]
+    
+    async def next_message_seq(self, conversation_id: UUID) -> int:
+        result = self.supabase.table("messages").select("seq").eq(
+            "conversation_id", str(conversation_id)
+        ).order("seq", desc=True).limit(1).execute()
+        return result.data[0]["seq"] + 1 if result.data else 0
     
     async def add_message(self, message: MessageCreate) -> MessageResponse:
         logger.debug(f"Adding message to conversation: {message.conversation_id}")
         
         try:
-            result = self.supabase.table("messages").insert({
+            data = {
                 "conversation_id": str(message.conversation_id),
                 "role": message.role.value,
                 "content": message.content
-            }).execute()
+            }
+            if message.seq is not None:
+                data["seq"] = message.seq
+            
+            result = self.supabase.table("messages").insert(data).execute()
             
             if not result.data:
                 logger.error(f"Failed to add message: No data returned")
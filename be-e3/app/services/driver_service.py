@@ -1,23 +1,50 @@
 import logging
-from typing import List
+import re
+from typing import Dict, List, Optional
 from uuid import UUID
 from fastapi import HTTPException, status
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter
+from app.config import settings
 from app.database.client import get_supabase
-from app.models.driver import DriverCreate, DriverUpdate, DriverResponse
+from app.models.driver import DriverCreate, DriverUpdate, DriverResponse, DriverImportRejection, DriverImportResponse, DriverSearchResult
 
 logger = logging.getLogger(__name__)
 
+DRIVER_LIST_ADAPTER = TypeAdapter(List[DriverResponse])
+DRIVER_SEARCH_ADAPTER = TypeAdapter(List[DriverSearchResult])
+NON_DIGITS = re.compile(r"\D")
+UNIQUE_VIOLATION = "23505"
+
+def normalize_phone_number(phone_number: Optional[str]) -> Optional[str]:
+    text = (phone_number or "").strip()
+    if text.startswith("00"):
+        text = "+" + text[2:]
+    digits = NON_DIGITS.sub("", text)
+    
+    if not text.startswith("+"):
+        country_code = settings.default_phone_country_code
+        if len(digits) == 10:
+            digits = country_code + digits
+        elif not (digits.startswith(country_code) and len(digits) == len(country_code) + 10):
+            return None
+    
+    if not 8 <= len(digits) <= 15 or digits.startswith("0"):
+        return None
+    return "+" + digits
+
 class DriverService:
     def __init__(self):
         self.supabase = get_supabase()
     
     async def create_driver(self, driver: DriverCreate) -> DriverResponse:
         logger.info(f"Creating driver: {driver.name}")
+        phone_number = self._normalize_or_400(driver.phone_number)
         
         try:
             result = self.supabase.table("drivers").insert({
                 "name": driver.name,
-                "phone_number": driver.phone_number
+                "phone_number": phone_number
             }).execute()
             
             if not result.data:
@@ -31,6 +58,17 @@ class DriverService:
             return DriverResponse(**result.data[0])
         except HTTPException:
             raise
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A driver with phone number {phone_number} already exists"
+                )
+            logger.error(f"Error creating driver: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create driver: {str(e)}"
+            )
         except Exception as e:
             logger.error(f"Error creating driver: {e}")
             raise HTTPException(
@@ -38,6 +76,90 @@ class DriverService:
                 detail=f"Failed to create driver: {str(e)}"
             )
     
+    async def find_driver_by_phone(self, phone_number: str) -> Optional[DriverResponse]:
+        result = self.supabase.table("drivers").select("*").eq("phone_number", phone_number).execute()
+        return DriverResponse(**result.data[0]) if result.data else None
+    
+    async def get_or_create_driver(self, driver: DriverCreate) -> DriverResponse:
+        phone_number = self._normalize_or_400(driver.phone_number)
+        existing = await self.find_driver_by_phone(phone_number)
+        if existing:
+            logger.info(f"Reusing existing driver {existing.id} for phone number {phone_number}")
+            return existing
+        
+        try:
+            return await self.create_driver(DriverCreate(name=driver.name, phone_number=phone_number))
+        except HTTPException as e:
+            if e.status_code != status.HTTP_409_CONFLICT:
+                raise
+            return await self.find_driver_by_phone(phone_number)
+    
+    async def import_drivers(self, rows: List[Dict]) -> DriverImportResponse:
+        logger.info(f"Importing {len(rows)} drivers")
+        rejections: List[DriverImportRejection] = []
+        by_phone: Dict[str, Dict] = {}
+        
+        for index, row in enumerate(rows, start=1):
+            name = str(row.get("name") or "").strip()
+            raw_phone = str(row.get("phone_number") or row.get("phone") or "").strip()
+            phone_number = normalize_phone_number(raw_phone)
+            
+            if not name:
+                rejections.append(DriverImportRejection(row=index, phone_number=raw_phone or None, error="Missing name"))
+            elif not phone_number:
+                rejections.append(DriverImportRejection(row=index, name=name, phone_number=raw_phone or None, error="Invalid phone number"))
+            else:
+                previous = by_phone.get(phone_number)
+                if previous:
+                    rejections.append(DriverImportRejection(
+                        row=previous["row"],
+                        name=previous["name"],
+                        phone_number=phone_number,
+                        error=f"Superseded by row {index} with the same phone number"
+                    ))
+                by_phone[phone_number] = {"row": index, "name": name}
+        
+        inserted = updated = unchanged = 0
+        phones = list(by_phone)
+        for start in range(0, len(phones), settings.driver_import_batch_size):
+            batch = phones[start:start + settings.driver_import_batch_size]
+            existing = self.supabase.table("drivers").select("phone_number, name").in_("phone_number", batch).execute()
+            existing_names = {row["phone_number"]: row["name"] for row in existing.data}
+            
+            upserts = []
+            for phone_number in batch:
+                name = by_phone[phone_number]["name"]
+                if phone_number not in existing_names:
+                    inserted += 1
+                elif existing_names[phone_number] != name:
+                    updated += 1
+                else:
+                    unchanged += 1
+                    continue
+                upserts.append({"name": name, "phone_number": phone_number})
+            
+            if upserts:
+                self.supabase.table("drivers").upsert(upserts, on_conflict="phone_number").execute()
+        
+        logger.info(f"Imported drivers: {inserted} inserted, {updated} updated, {unchanged} unchanged, {len(rejections)} rejected")
+        return DriverImportResponse(
+            total=len(rows),
+            inserted=inserted,
+            updated=updated,
+            unchanged=unchanged,
+            rejected=len(rejections),
+            rejections=sorted(rejections, key=lambda rejection: rejection.row)
+        )
+    
+    def _normalize_or_400(self, phone_number: str) -> str:
+        normalized = normalize_phone_number(phone_number)
+        if not normalized:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid phone number: {phone_number}"
+            )
+        return normalized
+    
     async def get_driver(self, driver_id: UUID) -> DriverResponse:
         result = self.supabase.table("drivers").select("*").eq("id", str(driver_id)).execute()
         
@@ -51,10 +173,16 @@ class DriverService:
     
     async def list_drivers(self) -> List[DriverResponse]:
         result = self.supabase.table("drivers").select("*").execute()
-        return [DriverResponse(**driver) for driver in result.data]
+        return DRIVER_LIST_ADAPTER.validate_python(result.data)
+    
+    async def search_drivers(self, query: str, limit: int) -> List[DriverSearchResult]:
+        result = self.supabase.rpc("search_drivers", {"p_query": query, "p_limit": limit}).execute()
+        return DRIVER_SEARCH_ADAPTER.validate_python(result.data or [])
     
     async def update_driver(self, driver_id: UUID, driver: DriverUpdate) -> DriverResponse:
         update_data = {k: v for k, v in driver.model_dump().items() if v is not None}
+        if "phone_number" in update_data:
+            update_data["phone_number"] = self._normalize_or_400(update_data["phone_number"])
         
         if not update_data:
             raise HTTPException(
@@ -62,7 +190,15 @@ class DriverService:
                 detail="No fields to update"
             )
         
-        result = self.supabase.table("drivers").update(update_data).eq("id", str(driver_id)).execute()
+        try:
+            result = self.supabase.table("drivers").update(update_data).eq("id", str(driver_id)).execute()
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A driver with phone number {update_data['phone_number']} already exists"
+                )
+            raise
         
         if not result.data:
             raise HTTPException(
@@ -0,0 +1,171 @@
+import asyncio
+import csv
+import io
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Set
+import orjson
+from app.config import settings
+from app.database.client import get_supabase
+from app.models.conversation import ConversationListFilters, ExportFormat
+from app.services.conversation_service import apply_conversation_filters
+from app.services.extracted_fields import EXTRACTED_FIELDS_BY_NAME, EXTRACTED_FIELD_NAMES
+from app.services.transcript_store import utterance_created_at
+
+logger = logging.getLogger(__name__)
+
+EXPORT_INCLUDE_FIELDS = {"transcript", "messages"}
+EXPORT_BASE_FIELDS = [
+    "id", "agent_id", "agent_name", "driver_id", "driver_name", "load_number", "status",
+    "started_at", "completed_at", "duration_ms", "recording_url", "emergency_detected",
+    *EXTRACTED_FIELD_NAMES, "structured_data"
+]
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet"
+}
+JSON_FIELDS = {"structured_data", "messages"}
+TIMESTAMP_FIELDS = {"started_at", "completed_at"}
+
+def export_fields(include: Set[str]) -> List[str]:
+    return EXPORT_BASE_FIELDS + [field for field in ("transcript", "messages") if field in include]
+
+class ExportService:
+    def __init__(self):
+        self.supabase = get_supabase()
+    
+    async def iter_batches(self, filters: ConversationListFilters, include: Set[str]) -> AsyncIterator[List[Dict]]:
+        columns = [field for field in EXPORT_BASE_FIELDS if field not in ("agent_name", "driver_name")]
+        columns += ["agents(name)", "drivers(name)"]
+        if "transcript" in include:
+            columns.append("transcript")
+        if "messages" in include:
+            columns += ["messages(role, content, created_at)", "transcript_utterances"]
+        
+        cursor = None
+        exported = 0
+        while True:
+            query = apply_conversation_filters(self.supabase.table("conversations").select(", ".join(columns)), filters)
+            if cursor:
+                started_at, conversation_id = cursor
+                query = query.or_(f'started_at.gt."{started_at}",and(started_at.eq."{started_at}",id.gt.{conversation_id})')
+            if "messages" in include:
+                query = query.order("seq", foreign_table="messages")
+            query = query.order("started_at").order("id").limit(settings.export_batch_size)
+            
+            result = await asyncio.to_thread(query.execute)
+            rows = result.data or []
+            for row in rows:
+                row["agent_name"] = (row.pop("agents") or {}).get("name")
+                row["driver_name"] = (row.pop("drivers") or {}).get("name")
+                utterances = row.pop("transcript_utterances", None)
+                if utterances and not row.get("messages"):
+                    row["messages"] = [
+                        {
+                            "role": utterance["role"],
+                            "content": utterance["content"],
+                            "created_at": utterance_created_at(row["started_at"], utterance.get("start_ms")).isoformat()
+                        }
+                        for utterance in utterances
+                    ]
+            if rows:
+                exported += len(rows)
+                yield rows
+            
+            if len(rows) < settings.export_batch_size:
+                logger.info(f"Exported {exported} conversations")
+                return
+            cursor = (rows[-1]["started_at"], rows[-1]["id"])
+
+async def ndjson_chunks(batches: AsyncIterator[List[Dict]], fields: List[str]) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield b"".join(orjson.dumps({field: row.get(field) for field in fields}) + b"\n" for row in rows)
+
+async def csv_chunks(batches: AsyncIterator[List[Dict]], fields: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for rows in batches:
+        for row in rows:
+            writer.writerow([_csv_value(field, row.get(field)) for field in fields])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+def _csv_value(field: str, value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if field in JSON_FIELDS:
+        return orjson.dumps(value).decode()
+    return value
+
+async def parquet_chunks(batches: AsyncIterator[List[Dict]], fields: List[str]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([(field, _parquet_type(pa, field)) for field in fields])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    try:
+        async for rows in batches:
+            columns = {field: [_parquet_value(field, row.get(field)) for row in rows] for field in fields}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _parquet_type(pa, field: str):
+    if field in TIMESTAMP_FIELDS:
+        return pa.timestamp("us", tz="UTC")
+    if field == "duration_ms":
+        return pa.int64()
+    if field == "emergency_detected":
+        return pa.bool_()
+    extracted = EXTRACTED_FIELDS_BY_NAME.get(field)
+    if extracted is not None and extracted.kind is bool:
+        return pa.bool_()
+    if extracted is not None and extracted.kind is int:
+        return pa.int64()
+    return pa.string()
+
+def _parquet_value(field: str, value):
+    if value is None:
+        return None
+    if field in TIMESTAMP_FIELDS:
+        return datetime.fromisoformat(value)
+    if field in JSON_FIELDS:
+        return orjson.dumps(value).decode()
+    return value
+
+EXPORT_WRITERS = {
+    ExportFormat.NDJSON: ndjson_chunks,
+    ExportFormat.CSV: csv_chunks,
+    ExportFormat.PARQUET: parquet_chunks
+}
@@ -0,0 +1,72 @@
+import re
+from typing import Any, Dict, Optional
+
+TRUE_VALUES = {"true", "yes", "y", "secure", "secured"}
+FALSE_VALUES = {"false", "no", "n", "not secure", "unsecured", "insecure"}
+NUMBER_PATTERN = re.compile(r"-?\d+(\.\d+)?")
+
+class ExtractedField:
+    def __init__(self, name: str, kind: type, description: str, categorical: bool = False):
+        self.name = name
+        self.kind = kind
+        self.description = description
+        self.categorical = categorical
+    
+    def coerce(self, value: Any) -> Optional[Any]:
+        if value is None:
+            return None
+        if self.kind is bool:
+            return _coerce_bool(value)
+        if self.kind is int:
+            return _coerce_int(value)
+        
+        if isinstance(value, (dict, list)):
+            return None
+        text = str(value).strip()
+        if not text:
+            return None
+        if self.categorical:
+            return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_") or None
+        return text
+
+EXTRACTED_FIELDS = [
+    ExtractedField("call_outcome", str, "category of the call, e.g. in_transit_update, arrival_confirmation, emergency_escalation", categorical=True),
+    ExtractedField("emergency_type", str, "type of emergency if one occurred, e.g. accident, breakdown, medical", categorical=True),
+    ExtractedField("eta", str, "estimated arrival time as stated by the driver"),
+    ExtractedField("is_load_secure", bool, "whether the load is secure, if discussed"),
+    ExtractedField("customer", str, "customer or receiver name for the load, if mentioned"),
+    ExtractedField("detention_minutes", int, "minutes of detention at the facility, if mentioned")
+]
+
+EXTRACTED_FIELD_NAMES = [field.name for field in EXTRACTED_FIELDS]
+EXTRACTED_FIELDS_BY_NAME = {field.name: field for field in EXTRACTED_FIELDS}
+
+def _coerce_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    return None
+
+def _coerce_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = NUMBER_PATTERN.search(str(value))
+    return int(float(match.group())) if match else None
+
+def materialize_fields(structured_data: Optional[Dict]) -> Dict[str, Any]:
+    if not isinstance(structured_data, dict) or "error" in structured_data:
+        return {}
+    return {field.name: field.coerce(structured_data.get(field.name)) for field in EXTRACTED_FIELDS}
+
+def detect_emergency(structured_data: Optional[Dict]) -> bool:
+    if not isinstance(structured_data, dict) or "error" in structured_data:
+        return False
+    if _coerce_bool(structured_data.get("emergency_detected")):
+        return True
+    return EXTRACTED_FIELDS_BY_NAME["emergency_type"].coerce(structured_data.get("emergency_type")) is not None
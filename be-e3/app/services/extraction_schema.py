@@ -0,0 +1,78 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import orjson
+from pydantic import ConfigDict, TypeAdapter, with_config
+from typing_extensions import TypedDict
+from app.config import settings
+from app.services.extracted_fields import EXTRACTED_FIELDS
+
+FIELD_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_]{0,63}$")
+JSON_TYPES = {"string": str, "number": float, "integer": int, "boolean": bool}
+PYTHON_JSON_TYPES = {str: "string", float: "number", int: "integer", bool: "boolean"}
+
+EXTRACTION_FIELDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "fields": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "description": "snake_case key"},
+                    "type": {"type": "string", "enum": list(JSON_TYPES)},
+                    "description": {"type": "string"}
+                },
+                "required": ["name", "type", "description"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["fields"],
+    "additionalProperties": False
+}
+
+STANDARD_EXTRACTION_FIELDS = [
+    {"name": field.name, "type": PYTHON_JSON_TYPES[field.kind], "description": field.description}
+    for field in EXTRACTED_FIELDS
+] + [
+    {"name": "emergency_detected", "type": "boolean", "description": "whether an emergency was reported during the call"}
+]
+
+def build_extraction_schema(fields: List[Dict]) -> Dict:
+    properties = {}
+    for field in STANDARD_EXTRACTION_FIELDS + fields:
+        name = str(field.get("name", "")).strip().lower()
+        if field.get("type") not in JSON_TYPES or not FIELD_NAME_PATTERN.match(name) or name in properties:
+            continue
+        if len(properties) >= len(STANDARD_EXTRACTION_FIELDS) + settings.extraction_schema_max_fields:
+            break
+        properties[name] = {"type": [field["type"], "null"], "description": str(field.get("description", ""))}
+    
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+DEFAULT_EXTRACTION_SCHEMA = build_extraction_schema([])
+
+def extraction_response_format(schema: Dict, name: str = "call_extraction") -> Dict:
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema}
+    }
+
+def compile_extraction_validator(schema: Optional[Dict]) -> TypeAdapter:
+    return _compile_validator(orjson.dumps(schema or DEFAULT_EXTRACTION_SCHEMA))
+
+@lru_cache(maxsize=256)
+def _compile_validator(schema_json: bytes) -> TypeAdapter:
+    schema = orjson.loads(schema_json)
+    fields: Dict[str, Any] = {}
+    for name, definition in schema["properties"].items():
+        json_type = next(kind for kind in definition["type"] if kind != "null")
+        fields[name] = Optional[JSON_TYPES[json_type]]
+    result_type = with_config(ConfigDict(extra="forbid"))(TypedDict("ExtractionResult", fields))
+    return TypeAdapter(result_type)
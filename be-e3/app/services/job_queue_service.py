@@ -0,0 +1,71 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List
+from app.config import settings
+from app.database.client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+CALL_ENDED_JOB = "call_ended"
+
+class JobQueueService:
+    def __init__(self):
+        self.supabase = get_supabase()
+    
+    def enqueue(self, kind: str, call_id: str, payload: Dict) -> bool:
+        result = self.supabase.rpc("enqueue_processing_job", {
+            "p_kind": kind,
+            "p_call_id": call_id,
+            "p_payload": payload
+        }).execute()
+        enqueued = bool(result.data)
+        if enqueued:
+            logger.info(f"Enqueued {kind} job for call: {call_id}")
+        else:
+            logger.info(f"{kind} job already pending for call: {call_id}")
+        return enqueued
+    
+    def claim(self, worker: str, limit: int) -> List[Dict]:
+        result = self.supabase.rpc("claim_processing_jobs", {
+            "p_worker": worker,
+            "p_limit": limit,
+            "p_lock_seconds": settings.worker_job_lock_seconds
+        }).execute()
+        return result.data or []
+    
+    def complete(self, job: Dict) -> None:
+        self._update(job, {
+            "status": "done",
+            "locked_by": None,
+            "locked_until": None,
+            "last_error": None
+        })
+    
+    def fail(self, job: Dict, error: str) -> None:
+        if job["attempts"] >= settings.worker_max_attempts:
+            logger.error(f"{job['kind']} job for call {job['call_id']} failed permanently after {job['attempts']} attempts")
+            self._update(job, {"status": "failed", "locked_by": None, "locked_until": None, "last_error": error})
+            return
+        
+        delay = min(settings.worker_retry_max_seconds, settings.worker_retry_base_seconds * 2 ** (job["attempts"] - 1))
+        self._update(job, {
+            "status": "queued",
+            "available_at": (datetime.utcnow() + timedelta(seconds=delay)).isoformat(),
+            "locked_by": None,
+            "locked_until": None,
+            "last_error": error
+        })
+    
+    def release(self, job: Dict) -> None:
+        self._update(job, {
+            "status": "queued",
+            "attempts": max(job["attempts"] - 1, 0),
+            "locked_by": None,
+            "locked_until": None
+        })
+    
+    def _update(self, job: Dict, update_data: Dict) -> None:
+        update_data["updated_at"] = datetime.utcnow().isoformat()
+        self.supabase.table("processing_jobs").update(update_data).eq(
+            "id", job["id"]
+        ).eq("locked_by", job["locked_by"]).execute()
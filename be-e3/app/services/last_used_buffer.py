@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict
+from uuid import UUID
+from app.config import settings
+from app.database.client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+class LastUsedBuffer:
+    def __init__(self):
+        self.supabase = get_supabase()
+        self._pending: Dict[str, datetime] = {}
+        self._lock = asyncio.Lock()
+    
+    def touch(self, agent_id: UUID, used_at: datetime = None) -> None:
+        key = str(agent_id)
+        used_at = used_at or datetime.utcnow()
+        current = self._pending.get(key)
+        if current is None or used_at > current:
+            self._pending[key] = used_at
+    
+    async def run(self) -> None:
+        logger.info(f"Starting last_used_at write-behind every {settings.last_used_flush_interval_seconds}s")
+        while True:
+            await asyncio.sleep(settings.last_used_flush_interval_seconds)
+            await self.flush()
+    
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self._pending:
+                return 0
+            
+            pending, self._pending = self._pending, {}
+            updates = [{"id": agent_id, "last_used_at": used_at.isoformat()} for agent_id, used_at in pending.items()]
+            try:
+                self.supabase.rpc("touch_agents_last_used", {"p_updates": updates}).execute()
+                logger.debug(f"Flushed last_used_at for {len(updates)} agents")
+                return len(updates)
+            except Exception as e:
+                logger.error(f"Failed to flush last_used_at for {len(updates)} agents: {e}")
+                for agent_id, used_at in pending.items():
+                    self.touch(agent_id, used_at)
+                return 0
+
+_buffer: LastUsedBuffer = None
+
+def get_last_used_buffer() -> LastUsedBuffer:
+    global _buffer
+    if _buffer is None:
+        _buffer = LastUsedBuffer()
+    return _buffer
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from app.config import settings
+from app.database.client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+LEASE_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class LeaseService:
+    def __init__(self):
+        self.supabase = get_supabase()
+        self.owner = LEASE_OWNER
+    
+    async def acquire(self, key: str, ttl_seconds: Optional[int] = None) -> bool:
+        result = self.supabase.rpc("acquire_lease", {
+            "p_key": key,
+            "p_owner": self.owner,
+            "p_ttl_seconds": ttl_seconds or settings.lease_ttl_seconds
+        }).execute()
+        return bool(result.data)
+    
+    async def release(self, key: str) -> None:
+        self.supabase.rpc("release_lease", {"p_key": key, "p_owner": self.owner}).execute()
+    
+    async def try_acquire(self, key: str, ttl_seconds: Optional[int] = None) -> bool:
+        try:
+            return await self.acquire(key, ttl_seconds)
+        except Exception as e:
+            logger.error(f"Failed to acquire lease {key}, continuing without it: {e}")
+            return True
+    
+    @asynccontextmanager
+    async def hold(self, key: str, ttl_seconds: Optional[int] = None) -> AsyncIterator[bool]:
+        ttl = ttl_seconds or settings.lease_ttl_seconds
+        if not await self.try_acquire(key, ttl):
+            logger.info(f"Lease {key} is held by another worker")
+            yield False
+            return
+        
+        heartbeat = asyncio.create_task(self._heartbeat(key, ttl))
+        try:
+            yield True
+        finally:
+            heartbeat.cancel()
+            try:
+                await self.release(key)
+            except Exception as e:
+                logger.error(f"Failed to release lease {key}: {e}")
+    
+    async def _heartbeat(self, key: str, ttl_seconds: int) -> None:
+        while True:
+            await asyncio.sleep(ttl_seconds / 3)
+            try:
+                if not await self.acquire(key, ttl_seconds):
+                    logger.warning(f"Lost lease {key} to another worker")
+                    return
+            except Exception as e:
+                logger.error(f"Failed to renew lease {key}: {e}")
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from app.config import settings
+from app.database.client import get_supabase
+from app.models.conversation import ConversationStatus
+from app.services.agent_service import AgentService
+from app.services.extracted_fields import materialize_fields
+from app.services.lease_service import LeaseService
+from app.services.post_processing_service import PostProcessingService, is_emergency_transcript
+from app.services.retell_service import RetellService
+from app.services.task_registry import get_task_registry
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATUSES = [ConversationStatus.PENDING.value, ConversationStatus.IN_PROGRESS.value]
+LIVE_CALL_STATUSES = {"registered", "ongoing"}
+POLLER_LEASE_KEY = "live_transcript_poller"
+
+def utterance_parts(utterance: Any) -> Tuple[str, str]:
+    if isinstance(utterance, dict):
+        return utterance.get("role"), utterance.get("content", "")
+    return getattr(utterance, "role", None), getattr(utterance, "content", "")
+
+def format_utterances(utterances: List[Any]) -> str:
+    lines = []
+    for utterance in utterances:
+        role, content = utterance_parts(utterance)
+        if content:
+            lines.append(f"{'Agent' if role == 'agent' else 'User'}: {content}")
+    return "\n".join(lines)
+
+class _LiveCall:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.utterances: List[Any] = []
+
+_live_calls: Dict[str, _LiveCall] = {}
+
+def forget_live_call(call_id: str) -> None:
+    _live_calls.pop(call_id, None)
+
+class LiveExtractionService:
+    def __init__(self):
+        self.supabase = get_supabase()
+        self.post_processing_service = PostProcessingService()
+        self.agent_service = AgentService()
+        self.lease_service = LeaseService()
+    
+    def submit(self, call_id: str, utterances: List[Any]) -> None:
+        live_call = _live_calls.setdefault(call_id, _LiveCall())
+        if len(utterances) >= len(live_call.utterances):
+            live_call.utterances = list(utterances)
+        
+        if live_call.lock.locked():
+            return
+        
+        get_task_registry().spawn(f"live_extraction:{call_id}", self.process(call_id))
+    
+    def forget(self, call_id: str) -> None:
+        forget_live_call(call_id)
+    
+    async def process(self, call_id: str) -> None:
+        live_call = _live_calls.get(call_id)
+        if live_call is None:
+            return
+        
+        async with live_call.lock, self.lease_service.hold(f"live_extraction:{call_id}") as acquired:
+            if not acquired:
+                return
+            
+            result = self.supabase.table("conversations").select(
+                "id, status, structured_data, live_transcript_cursor, emergency_detected, agents(id, prompts, additional_details, scenario_description, extraction_schema)"
+            ).eq("retell_call_id", call_id).execute()
+            
+            if not result.data or result.data[0]["status"] not in LIVE_STATUSES:
+                logger.debug(f"Skipping live extraction for call: {call_id}")
+                self.forget(call_id)
+                return
+            
+            conversation = result.data[0]
+            conversation_id = conversation["id"]
+            agent = conversation.get("agents") or {}
+            scenario_description = agent.get("prompts", "")
+            extraction_schema = None
+            structured_data = conversation.get("structured_data") or {}
+            cursor = conversation.get("live_transcript_cursor") or 0
+            emergency = bool(conversation.get("emergency_detected"))
+            
+            while call_id in _live_calls:
+                settled = live_call.utterances[:-1]
+                new_utterances = settled[cursor:]
+                if not new_utterances:
+                    break
+                
+                new_transcript = format_utterances(new_utterances)
+                new_emergency = is_emergency_transcript(new_transcript)
+                if new_emergency and not emergency:
+                    emergency = True
+                    logger.warning(f"Emergency keywords detected in live call: {call_id}")
+                    self._update_live(conversation_id, {"emergency_detected": True})
+                
+                if len(new_utterances) < settings.live_extraction_min_new_utterances and not new_emergency:
+                    break
+                
+                if extraction_schema is None and agent.get("id"):
+                    extraction_schema = await self.agent_service.ensure_extraction_schema(agent)
+                extracted = await self.post_processing_service.extract_incremental_structured_data(
+                    previous_data=structured_data,
+                    new_transcript=new_transcript,
+                    scenario_description=scenario_description,
+                    extraction_schema=extraction_schema
+                )
+                if "error" in extracted:
+                    logger.error(f"Live extraction failed for call {call_id}: {extracted['error']}")
+                    break
+                
+                structured_data = extracted
+                cursor += len(new_utterances)
+                emergency = emergency or bool(structured_data.get("emergency_detected"))
+                self._update_live(conversation_id, {
+                    "structured_data": structured_data,
+                    "live_transcript_cursor": cursor,
+                    "emergency_detected": emergency,
+                    **materialize_fields(structured_data)
+                })
+                logger.info(f"Updated live structured data for conversation {conversation_id} at utterance {cursor}")
+    
+    async def finalize(
+        self,
+        conversation: Dict,
+        transcript_object: List[Any],
+        transcript: str,
+        scenario_description: str,
+        extraction_schema: Optional[Dict] = None
+    ) -> Dict:
+        cursor = conversation.get("live_transcript_cursor") or 0
+        structured_data = conversation.get("structured_data")
+        
+        if not cursor or not isinstance(structured_data, dict) or "error" in structured_data:
+            return await self.post_processing_service.extract_structured_data(
+                transcript=transcript,
+                scenario_description=scenario_description,
+                extraction_schema=extraction_schema
+            )
+        
+        remaining = transcript_object[cursor:]
+        if not remaining:
+            logger.info(f"Live extraction already covers the full transcript: {conversation['id']}")
+            return structured_data
+        
+        logger.info(f"Finalizing live extraction with {len(remaining)} remaining utterances: {conversation['id']}")
+        return await self.post_processing_service.extract_incremental_structured_data(
+            previous_data=structured_data,
+            new_transcript=format_utterances(remaining),
+            scenario_description=scenario_description,
+            extraction_schema=extraction_schema
+        )
+    
+    def _update_live(self, conversation_id: str, update_data: Dict) -> None:
+        self.supabase.table("conversations").update(update_data).eq(
+            "id", conversation_id
+        ).in_("status", LIVE_STATUSES).execute()
+
+class LiveTranscriptPoller:
+    def __init__(self):
+        self.supabase = get_supabase()
+        self.retell_service = RetellService()
+        self.live_extraction_service = LiveExtractionService()
+        self.lease_service = LeaseService()
+    
+    async def run(self) -> None:
+        logger.info(f"Starting live transcript poller every {settings.live_transcript_poll_interval_seconds}s")
+        lease_ttl = int(settings.live_transcript_poll_interval_seconds * 2) + 1
+        while True:
+            try:
+                if await self.lease_service.try_acquire(POLLER_LEASE_KEY, lease_ttl):
+                    await self.poll_once()
+                else:
+                    logger.debug("Live transcript poller lease is held by another replica, skipping poll")
+            except Exception as e:
+                logger.error(f"Error polling live transcripts: {e}")
+            await asyncio.sleep(settings.live_transcript_poll_interval_seconds)
+    
+    async def poll_once(self) -> None:
+        result = self.supabase.table("conversations").select("retell_call_id").eq(
+            "status", ConversationStatus.IN_PROGRESS.value
+        ).not_.is_("retell_call_id", "null").execute()
+        
+        semaphore = asyncio.Semaphore(settings.live_transcript_poll_concurrency)
+        
+        async def poll(call_id: str) -> None:
+            async with semaphore:
+                try:
+                    call_details = await self.retell_service.get_call_details(call_id, max_age_seconds=0)
+                except Exception as e:
+                    logger.error(f"Error polling call {call_id}: {e}")
+                    return
+            if call_details.get("call_status") in LIVE_CALL_STATUSES:
+                self.live_extraction_service.submit(call_id, call_details.get("transcript_object") or [])
+        
+        await asyncio.gather(*(poll(row["retell_call_id"]) for row in result.data))
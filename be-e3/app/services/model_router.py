@@ -0,0 +1,133 @@
+import math
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.config import settings
+
+ROUTE_EXTRACTION = "extraction"
+ROUTE_INCREMENTAL_EXTRACTION = "incremental_extraction"
+ROUTE_PROMPT_GENERATION = "prompt_generation"
+ROUTE_SCHEMA_GENERATION = "schema_generation"
+
+LATENCY_SAMPLE_SIZE = 500
+MIN_SYSTEM_PROMPT_CHARS = 500
+PROMPT_VARIABLES = ("{{driver_name}}", "{{load_number}}")
+
+def response_confidence(response: Any) -> Optional[float]:
+    logprobs = getattr(response.choices[0], "logprobs", None)
+    tokens = getattr(logprobs, "content", None) if logprobs else None
+    if not tokens:
+        return None
+    return math.exp(sum(token.logprob for token in tokens) / len(tokens))
+
+class _RouteModelStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency_ms_total = 0.0
+        self.latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+    
+    def snapshot(self) -> Dict:
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_latency_ms": round(self.latency_ms_total / self.calls, 1) if self.calls else None,
+            "p50_latency_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+            "p95_latency_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1) if latencies else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "avg_cost_usd": round(self.cost_usd / self.calls, 6) if self.calls else None
+        }
+
+class ModelRouter:
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, _RouteModelStats]] = {}
+        self._escalations: Dict[str, Dict[str, int]] = {}
+        self._started_at = datetime.utcnow().isoformat()
+    
+    def extraction_model(self, transcript: str, emergency: bool) -> str:
+        if not settings.model_routing_enabled or emergency:
+            return settings.openai_model
+        if len(transcript or "") > settings.routing_extraction_small_max_chars:
+            return settings.openai_model
+        return settings.openai_small_model
+    
+    def prompt_model(self, scenario_description: str, emergency: bool) -> str:
+        if not settings.model_routing_enabled or emergency:
+            return settings.openai_model
+        if len(scenario_description or "") > settings.routing_prompt_small_max_chars:
+            return settings.openai_model
+        return settings.openai_small_model
+    
+    def can_escalate(self, model: str) -> bool:
+        return model != settings.openai_model
+    
+    def extraction_escalation_reason(self, model: str, result: Dict, confidence: Optional[float]) -> Optional[str]:
+        if not self.can_escalate(model):
+            return None
+        if "error" in result:
+            return "validation_failure" if "raw_response" in result else "error"
+        if result.get("emergency_detected") or result.get("emergency_type"):
+            return "emergency"
+        if confidence is not None and confidence < settings.routing_min_confidence:
+            return "low_confidence"
+        return None
+    
+    def prompt_escalation_reason(self, model: str, system_prompt: str) -> Optional[str]:
+        if not self.can_escalate(model):
+            return None
+        if len(system_prompt) < MIN_SYSTEM_PROMPT_CHARS or any(variable not in system_prompt for variable in PROMPT_VARIABLES):
+            return "validation_failure"
+        return None
+    
+    def record(self, route: str, model: str, latency_ms: float, response: Any = None) -> None:
+        stats = self._stats.setdefault(route, {}).setdefault(model, _RouteModelStats())
+        stats.calls += 1
+        stats.latency_ms_total += latency_ms
+        stats.latencies.append(latency_ms)
+        
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            stats.errors += 1
+            return
+        stats.prompt_tokens += usage.prompt_tokens
+        stats.completion_tokens += usage.completion_tokens
+        prices = settings.openai_model_prices.get(model)
+        if prices:
+            stats.cost_usd += (usage.prompt_tokens * prices[0] + usage.completion_tokens * prices[1]) / 1_000_000
+    
+    def record_escalation(self, route: str, reason: str) -> None:
+        reasons = self._escalations.setdefault(route, {})
+        reasons[reason] = reasons.get(reason, 0) + 1
+    
+    def snapshot(self) -> Dict:
+        routes = {}
+        for route, models in self._stats.items():
+            small = models.get(settings.openai_small_model)
+            escalated = sum(self._escalations.get(route, {}).values())
+            routes[route] = {
+                "models": {model: stats.snapshot() for model, stats in models.items()},
+                "escalations": self._escalations.get(route, {}),
+                "escalation_rate": round(escalated / small.calls, 4) if small and small.calls else None,
+                "cost_usd": round(sum(stats.cost_usd for stats in models.values()), 6)
+            }
+        return {
+            "enabled": settings.model_routing_enabled,
+            "large_model": settings.openai_model,
+            "small_model": settings.openai_small_model,
+            "since": self._started_at,
+            "routes": routes
+        }
+
+_router: ModelRouter = None
+
+def get_model_router() -> ModelRouter:
+    global _router
+    if _router is None:
+        _router = ModelRouter()
+    return _router
@@ -0,0 +1,162 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+from openai import APIConnectionError, APIStatusError, APITimeoutError
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class OpenAIPriority(IntEnum):
+    EMERGENCY_EXTRACTION = 0
+    EXTRACTION = 1
+    PROMPT_GENERATION = 2
+
+def estimate_tokens(messages: List[Dict], max_completion_tokens: int) -> int:
+    prompt_tokens = sum(len(message.get("content") or "") // 4 + 4 for message in messages)
+    return prompt_tokens + max_completion_tokens
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def time_until(self, amount: float) -> float:
+        self._refill()
+        blocked = max(self.blocked_until - time.monotonic(), 0.0)
+        missing = max(amount - self.available, 0.0)
+        return max(blocked, missing / self.refill_per_second)
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.available = min(self.capacity, self.available - amount)
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+class OpenAIGovernor:
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_retries: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float
+    ):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self._waiters: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+
+    async def call(
+        self,
+        request: Callable[[], Awaitable[T]],
+        estimated_tokens: int,
+        priority: OpenAIPriority
+    ) -> T:
+        estimated_tokens = min(estimated_tokens, self._tokens.capacity)
+        attempt = 0
+
+        while True:
+            await self._acquire(estimated_tokens, priority)
+            try:
+                response = await request()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                logger.warning(f"OpenAI request failed ({e.__class__.__name__}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self._tokens.consume(usage.total_tokens - estimated_tokens)
+            return response
+
+    async def _acquire(self, tokens: float, priority: OpenAIPriority) -> None:
+        entry = (int(priority), next(self._sequence))
+
+        async with self._condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = max(self._requests.time_until(1), self._tokens.time_until(tokens))
+                        if timeout <= 0:
+                            self._requests.consume(1)
+                            self._tokens.consume(tokens)
+                            return
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        if isinstance(error, (APIConnectionError, APITimeoutError)):
+            retry_after = None
+        elif isinstance(error, APIStatusError) and (error.status_code == 429 or error.status_code >= 500):
+            retry_after = self._retry_after(error)
+        else:
+            return None
+
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff_base_seconds)
+        else:
+            delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * 2 ** attempt))
+
+        if isinstance(error, APIStatusError) and error.status_code == 429:
+            self._requests.block_for(delay)
+        return delay
+
+    def _retry_after(self, error: APIStatusError) -> Optional[float]:
+        headers = error.response.headers if error.response is not None else {}
+        if headers.get("retry-after-ms"):
+            try:
+                return float(headers["retry-after-ms"]) / 1000
+            except ValueError:
+                pass
+        if headers.get("retry-after"):
+            try:
+                return float(headers["retry-after"])
+            except ValueError:
+                pass
+        return None
+
+_governor: OpenAIGovernor = None
+
+def get_openai_governor() -> OpenAIGovernor:
+    global _governor
+    if _governor is None:
+        _governor = OpenAIGovernor(
+            requests_per_minute=settings.openai_requests_per_minute,
+            tokens_per_minute=settings.openai_tokens_per_minute,
+            max_retries=settings.openai_max_retries,
+            backoff_base_seconds=settings.openai_backoff_base_seconds,
+            backoff_max_seconds=settings.openai_backoff_max_seconds
+        )
+    return _governor
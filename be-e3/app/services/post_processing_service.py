@@ -1,30 +1,30 @@
 import json
 import logging
+import re
+import time
 from openai import AsyncOpenAI
-from typing import Dict
+from pydantic import TypeAdapter, ValidationError
+from typing import Dict, List, Optional, Tuple
 from app.config import settings
+from app.services.extraction_schema import compile_extraction_validator, extraction_response_format, DEFAULT_EXTRACTION_SCHEMA
+from app.services.model_router import ROUTE_EXTRACTION, ROUTE_INCREMENTAL_EXTRACTION, get_model_router, response_confidence
+from app.services.openai_governor import OpenAIPriority, estimate_tokens, get_openai_governor
 
 logger = logging.getLogger(__name__)
 
-class PostProcessingService:
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
-    
-    async def extract_structured_data(
-        self,
-        transcript: str,
-        scenario_description: str
-    ) -> Dict:
-        system_prompt = """You are an AI agent analyzing logistics dispatch call transcripts. Your task is to extract structured data from driver check-in conversations.
+EXTRACTION_COMPLETION_TOKENS_ESTIMATE = 300
+EMERGENCY_PATTERN = re.compile(
+    r"\b(emergency|accident|crash(ed)?|collision|injur(y|ed|ies)|hurt|bleeding|ambulance|medical|fire|smoke|blowout|breakdown|broke down|rollover|hazmat|spill|911)\b",
+    re.IGNORECASE
+)
+
+EXTRACTION_SYSTEM_PROMPT = """You are an AI agent analyzing logistics dispatch call transcripts. Your task is to extract structured data from driver check-in conversations.
 
 ANALYSIS INSTRUCTIONS:
 1. Read the entire call transcript carefully
 2. Identify what type of call this is based on the conversation content
-3. Extract ALL relevant information discussed in the call
-4. Return a JSON object containing only the data points that are relevant and mentioned
-5. Use descriptive, clear keys for each data point
-6. If a relevant data point was discussed but no clear answer was given, use null for that field
-7. Do not include fields for information that was never discussed or referenced
+3. Extract ALL relevant information discussed in the call into the fields of the response schema
+4. Use null for any field that was never discussed or that was discussed without a clear answer
 
 GUIDELINES FOR EXTRACTION:
 
@@ -51,7 +51,6 @@ Emergency Situations:
 - Document escalation actions (connecting to dispatcher, etc.)
 
 DATA QUALITY RULES:
-- Use clear, descriptive keys (snake_case preferred)
 - Values should be concise but complete
 - Use boolean true/false for yes/no questions that were clearly answered
 - Use null only when a topic was discussed but the answer is unclear/not provided
@@ -59,15 +58,32 @@ DATA QUALITY RULES:
 - Keep location and status descriptions as provided by the driver
 - Preserve specific details like door numbers, mile markers, times, etc.
 
-OUTPUT FORMAT:
-- Return ONLY valid JSON
-- No explanations, preamble, or text outside the JSON
-- Include only fields that are relevant to what was actually discussed
-- Ensure proper JSON syntax (quoted keys, proper commas, etc.)
+Extract the structured data:
+"""
+
+INCREMENTAL_EXTRACTION_INSTRUCTIONS = """
+
+INCREMENTAL UPDATE MODE:
+- You are given the structured data extracted so far and only the NEW utterances of the call
+- Return the COMPLETE updated object, keeping previous values unless the new utterances change them
+- If an emergency is mentioned, set "emergency_detected" to true and fill the emergency fields immediately
+"""
 
+def is_emergency_transcript(transcript: str) -> bool:
+    return bool(transcript and EMERGENCY_PATTERN.search(transcript))
 
-Extract the relevant structured data as JSON:
-        """
+class PostProcessingService:
+    def __init__(self):
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+        self.governor = get_openai_governor()
+        self.router = get_model_router()
+    
+    async def extract_structured_data(
+        self,
+        transcript: str,
+        scenario_description: str,
+        extraction_schema: Optional[Dict] = None
+    ) -> Dict:
         prompt = f"""Scenario requirements:
 {scenario_description}
 
@@ -75,23 +91,101 @@ Call transcript:
 {transcript}
 """
         logger.info("Calling OpenAI for structured data extraction")
+        messages = [{"role": "system", "content": EXTRACTION_SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+        return await self._extract(messages, is_emergency_transcript(transcript), extraction_schema, ROUTE_EXTRACTION, transcript)
+    
+    async def extract_incremental_structured_data(
+        self,
+        previous_data: Dict,
+        new_transcript: str,
+        scenario_description: str,
+        extraction_schema: Optional[Dict] = None
+    ) -> Dict:
+        prompt = f"""Scenario requirements:
+{scenario_description}
+
+Structured data extracted so far:
+{json.dumps(previous_data or {})}
+
+New utterances:
+{new_transcript}
+"""
+        logger.info("Calling OpenAI for incremental structured data extraction")
+        messages = [
+            {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT + INCREMENTAL_EXTRACTION_INSTRUCTIONS},
+            {"role": "user", "content": prompt}
+        ]
+        emergency = is_emergency_transcript(new_transcript) or bool((previous_data or {}).get("emergency_detected"))
+        return await self._extract(messages, emergency, extraction_schema, ROUTE_INCREMENTAL_EXTRACTION, new_transcript)
+    
+    async def _extract(
+        self,
+        messages: List[Dict],
+        emergency: bool,
+        extraction_schema: Optional[Dict],
+        route: str,
+        transcript: str
+    ) -> Dict:
+        schema = extraction_schema or DEFAULT_EXTRACTION_SCHEMA
+        validator = compile_extraction_validator(schema)
+        model = self.router.extraction_model(transcript, emergency)
         
-        try:
-            response = await self.client.chat.completions.create(
-                model=settings.openai_model,
-                messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
-            logger.info("Successfully received response from OpenAI")
-        except Exception as e:
-            logger.error(f"Failed to call OpenAI: {e}")
-            return {"error": "Failed to extract structured data", "details": str(e)}
-        
-        try:
-            result = json.loads(response.choices[0].message.content)
-            logger.info("Successfully parsed structured data")
+        result, confidence = await self._extract_with_model(messages, emergency, schema, validator, route, model)
+        reason = self.router.extraction_escalation_reason(model, result, confidence)
+        if reason is None:
             return result
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            return {"error": "Failed to parse structured data", "raw_response": response.choices[0].message.content}
\ No newline at end of file
+        
+        logger.info(f"Escalating {route} from {model} to {settings.openai_model}: {reason}")
+        self.router.record_escalation(route, reason)
+        result, _ = await self._extract_with_model(messages, emergency, schema, validator, route, settings.openai_model)
+        return result
+    
+    async def _extract_with_model(
+        self,
+        messages: List[Dict],
+        emergency: bool,
+        schema: Dict,
+        validator: TypeAdapter,
+        route: str,
+        model: str
+    ) -> Tuple[Dict, Optional[float]]:
+        escalates = self.router.can_escalate(model)
+        attempts = 1 if escalates else settings.extraction_max_attempts
+        content = None
+        
+        for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            try:
+                response = await self.governor.call(
+                    lambda: self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        response_format=extraction_response_format(schema),
+                        temperature=0.3,
+                        logprobs=escalates
+                    ),
+                    estimated_tokens=estimate_tokens(messages, EXTRACTION_COMPLETION_TOKENS_ESTIMATE),
+                    priority=OpenAIPriority.EMERGENCY_EXTRACTION if emergency else OpenAIPriority.EXTRACTION
+                )
+                logger.info(f"Successfully received response from OpenAI ({model})")
+            except Exception as e:
+                self.router.record(route, model, (time.monotonic() - started) * 1000)
+                logger.error(f"Failed to call OpenAI: {e}")
+                return {"error": "Failed to extract structured data", "details": str(e)}, None
+            self.router.record(route, model, (time.monotonic() - started) * 1000, response)
+            
+            message = response.choices[0].message
+            if getattr(message, "refusal", None):
+                logger.error(f"OpenAI refused structured data extraction: {message.refusal}")
+                return {"error": "Structured data extraction was refused", "details": message.refusal}, None
+            
+            content = message.content
+            try:
+                result = validator.validate_json(content or "")
+                logger.info("Successfully validated structured data")
+                return result, response_confidence(response) if escalates else None
+            except ValidationError as e:
+                logger.warning(f"Structured data from {model} failed schema validation (attempt {attempt}/{attempts}): {e.error_count()} errors")
+        
+        logger.error(f"Structured data from {model} failed schema validation after all attempts")
+        return {"error": "Failed to parse structured data", "raw_response": content}, None
@@ -1,12 +1,44 @@
+import json
 import logging
+import time
+from typing import Dict, List, Optional
 from openai import AsyncOpenAI
 from app.config import settings
+from app.services.extraction_schema import EXTRACTION_FIELDS_SCHEMA, STANDARD_EXTRACTION_FIELDS, extraction_response_format
+from app.services.post_processing_service import is_emergency_transcript
+from app.services.model_router import ROUTE_PROMPT_GENERATION, ROUTE_SCHEMA_GENERATION, get_model_router
+from app.services.openai_governor import OpenAIPriority, estimate_tokens, get_openai_governor
 
 logger = logging.getLogger(__name__)
 
+PROMPT_COMPLETION_TOKENS_ESTIMATE = 2500
+SCHEMA_COMPLETION_TOKENS_ESTIMATE = 800
+
+EXTRACTION_FIELDS_SYSTEM_PROMPT = f"""You design the data extraction schema for a logistics voice agent's call transcripts.
+
+Given the scenario, list the additional data points the agent is expected to collect, beyond these standard fields which are always extracted:
+{", ".join(field["name"] for field in STANDARD_EXTRACTION_FIELDS)}
+
+RULES:
+- Use short snake_case names (e.g. current_location, door_number, safety_status)
+- Pick the narrowest type: boolean for yes/no answers, integer for counts and minutes, number for measurements, string otherwise
+- Write a one-line description of what the value means
+- Only include fields that the scenario actually asks the agent to collect
+- At most {settings.extraction_schema_max_fields} fields
+"""
+
+def parse_extraction_fields(content: Optional[str]) -> Optional[List[Dict]]:
+    try:
+        fields = json.loads(content)["fields"]
+    except (TypeError, ValueError, KeyError):
+        return None
+    return fields if isinstance(fields, list) else None
+
 class PromptGenerationService:
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+        self.governor = get_openai_governor()
+        self.router = get_model_router()
     
     async def generate_system_prompt(
         self,
@@ -614,16 +646,95 @@ Additional context:
 {context_addition}"""
 
         logger.info("Calling OpenAI for system prompt generation")
+        messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+        model = self.router.prompt_model(scenario_description, is_emergency_transcript(f"{scenario_description} {additional_context or ''}"))
         
         try:
-            response = await self.client.chat.completions.create(
-                model=settings.openai_model,
-                messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
-                temperature=0.7
-            )
-            logger.info("Successfully generated system prompt")
-            return response.choices[0].message.content.strip()
+            generated = await self._complete(ROUTE_PROMPT_GENERATION, model, messages, PROMPT_COMPLETION_TOKENS_ESTIMATE, temperature=0.7)
+            reason = self.router.prompt_escalation_reason(model, generated)
         except Exception as e:
-            logger.error(f"Failed to generate system prompt: {e}")
+            if not self.router.can_escalate(model):
+                logger.error(f"Failed to generate system prompt: {e}")
+                raise
+            generated, reason = None, "error"
+        
+        if reason:
+            logger.info(f"Escalating system prompt generation from {model} to {settings.openai_model}: {reason}")
+            self.router.record_escalation(ROUTE_PROMPT_GENERATION, reason)
+            try:
+                generated = await self._complete(ROUTE_PROMPT_GENERATION, settings.openai_model, messages, PROMPT_COMPLETION_TOKENS_ESTIMATE, temperature=0.7)
+            except Exception as e:
+                logger.error(f"Failed to generate system prompt: {e}")
+                raise
+        
+        logger.info("Successfully generated system prompt")
+        return generated
+    
+    async def generate_extraction_fields(
+        self,
+        scenario_description: str,
+        additional_context: str = None
+    ) -> List[Dict]:
+        context_addition = f"\n\nAdditional context:\n{additional_context}" if additional_context else ""
+        messages = [
+            {"role": "system", "content": EXTRACTION_FIELDS_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Scenario requirements:\n{scenario_description}{context_addition}"}
+        ]
+        response_format = extraction_response_format(EXTRACTION_FIELDS_SCHEMA, "extraction_fields")
+        model = self.router.prompt_model(scenario_description, is_emergency_transcript(f"{scenario_description} {additional_context or ''}"))
+        
+        logger.info("Calling OpenAI for extraction schema generation")
+        try:
+            content = await self._complete(ROUTE_SCHEMA_GENERATION, model, messages, SCHEMA_COMPLETION_TOKENS_ESTIMATE, temperature=0.2, response_format=response_format)
+            fields = parse_extraction_fields(content)
+            reason = None if fields else "validation_failure"
+        except Exception as e:
+            if not self.router.can_escalate(model):
+                logger.error(f"Failed to generate extraction schema: {e}")
+                raise
+            fields, reason = None, "error"
+        
+        if reason and self.router.can_escalate(model):
+            logger.info(f"Escalating extraction schema generation from {model} to {settings.openai_model}: {reason}")
+            self.router.record_escalation(ROUTE_SCHEMA_GENERATION, reason)
+            try:
+                content = await self._complete(ROUTE_SCHEMA_GENERATION, settings.openai_model, messages, SCHEMA_COMPLETION_TOKENS_ESTIMATE, temperature=0.2, response_format=response_format)
+                fields = parse_extraction_fields(content)
+            except Exception as e:
+                logger.error(f"Failed to generate extraction schema: {e}")
+                raise
+        
+        if fields is None:
+            logger.error("Failed to generate extraction schema: malformed response")
+            raise ValueError("Malformed extraction fields response")
+        
+        logger.info(f"Generated {len(fields)} extraction fields")
+        return fields
+    
+    async def _complete(
+        self,
+        route: str,
+        model: str,
+        messages: List[Dict],
+        completion_tokens_estimate: int,
+        temperature: float,
+        response_format: Optional[Dict] = None
+    ) -> str:
+        options = {"response_format": response_format} if response_format else {}
+        started = time.monotonic()
+        try:
+            response = await self.governor.call(
+                lambda: self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    **options
+                ),
+                estimated_tokens=estimate_tokens(messages, completion_tokens_estimate),
+                priority=OpenAIPriority.PROMPT_GENERATION
+            )
+        except Exception:
+            self.router.record(route, model, (time.monotonic() - started) * 1000)
             raise
-
+        self.router.record(route, model, (time.monotonic() - started) * 1000, response)
+        return response.choices[0].message.content.strip()
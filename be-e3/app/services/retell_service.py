@@ -1,10 +1,19 @@
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from retell import Retell
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+CALL_DETAIL_FIELDS = ("transcript", "transcript_object", "recording_url", "duration_ms")
+TERMINAL_CALL_STATUSES = {"ended", "error"}
+
+_call_details_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+_call_details_inflight: Dict[str, asyncio.Task] = {}
+
 class RetellService:
     def __init__(self):
         self.client = Retell(api_key=settings.retell_api_key)
@@ -20,7 +29,8 @@ class RetellService:
         logger.info(f"Creating Retell agent: {name}")
         
         try:
-            retell_llm = self.client.llm.create(
+            retell_llm = await asyncio.to_thread(
+                self.client.llm.create,
                 general_prompt=system_prompt,
                 begin_message="Hi {{driver_name}}, this is dispatch with a check call on load {{load_number}}. Can you give me an update on your status?",
                 general_tools=[],
@@ -39,7 +49,8 @@ class RetellService:
             raise
         
         try:
-            agent = self.client.agent.create(
+            agent = await asyncio.to_thread(
+                self.client.agent.create,
                 agent_name=name,
                 voice_id=voice_id or settings.retell_default_voice_id,
                 response_engine={
@@ -60,7 +71,7 @@ class RetellService:
             raise
         
         try:
-            self.client.agent.publish(agent.agent_id)
+            await asyncio.to_thread(self.client.agent.publish, agent.agent_id)
             logger.info(f"Published Retell agent: {agent.agent_id}")
         except Exception as e:
             logger.error(f"Failed to publish Retell agent: {e}")
@@ -72,6 +83,18 @@ class RetellService:
             "llm_id": retell_llm.llm_id
         }
     
+    async def delete_agent(self, agent_id: str, llm_id: Optional[str] = None) -> None:
+        logger.info(f"Deleting Retell agent: {agent_id}")
+        
+        try:
+            await asyncio.to_thread(self.client.agent.delete, agent_id)
+            if llm_id:
+                await asyncio.to_thread(self.client.llm.delete, llm_id)
+            logger.info(f"Deleted Retell agent: {agent_id}")
+        except Exception as e:
+            logger.error(f"Failed to delete Retell agent: {e}")
+            raise
+    
     async def create_web_call(
         self,
         agent_id: str,
@@ -97,17 +120,40 @@ class RetellService:
             "agent_id": call.agent_id
         }
     
-    async def get_call_details(self, call_id: str) -> Dict:
+    async def get_call_details(self, call_id: str, max_age_seconds: Optional[float] = None) -> Dict:
+        max_age = settings.retell_call_cache_ttl_seconds if max_age_seconds is None else max_age_seconds
+        cached = _call_details_cache.get(call_id)
+        if cached and time.monotonic() - cached[0] <= max_age:
+            logger.debug(f"Using cached call details: {call_id}")
+            _call_details_cache.move_to_end(call_id)
+            return dict(cached[1])
+        
+        task = _call_details_inflight.get(call_id)
+        if task is None:
+            task = asyncio.create_task(self._retrieve_call_details(call_id))
+            _call_details_inflight[call_id] = task
+            task.add_done_callback(lambda _: _call_details_inflight.pop(call_id, None))
+        else:
+            logger.debug(f"Joining in-flight call details request: {call_id}")
+        
+        return dict(await asyncio.shield(task))
+    
+    def invalidate_call_details(self, call_id: str, keep_terminal: bool = True) -> None:
+        cached = _call_details_cache.get(call_id)
+        if cached and not (keep_terminal and cached[1].get("call_status") in TERMINAL_CALL_STATUSES):
+            _call_details_cache.pop(call_id, None)
+    
+    async def _retrieve_call_details(self, call_id: str) -> Dict:
         logger.debug(f"Retrieving call details: {call_id}")
         
         try:
-            call = self.client.call.retrieve(call_id)
+            call = await asyncio.to_thread(self.client.call.retrieve, call_id)
             logger.info(f"Retrieved call details: {call_id}")
         except Exception as e:
             logger.error(f"Failed to retrieve call details: {e}")
             raise
 
-        return {
+        call_details = {
             "call_id": call.call_id,
             "agent_id": call.agent_id,
             "call_status": call.call_status,
@@ -118,4 +164,38 @@ class RetellService:
             "disconnection_reason": call.disconnection_reason,
             "call_analysis": call.call_analysis if hasattr(call, 'call_analysis') else None
         }
-
+        
+        if len(_call_details_cache) >= settings.retell_call_cache_max_entries:
+            expired_before = time.monotonic() - settings.retell_call_cache_ttl_seconds
+            for cached_call_id, (fetched_at, _) in list(_call_details_cache.items()):
+                if fetched_at < expired_before:
+                    del _call_details_cache[cached_call_id]
+        _call_details_cache.pop(call_id, None)
+        while _call_details_cache and len(_call_details_cache) >= settings.retell_call_cache_max_entries:
+            _call_details_cache.popitem(last=False)
+        _call_details_cache[call_id] = (time.monotonic(), call_details)
+        return call_details
+    
+    def call_details_from_payload(self, call: Dict) -> Optional[Dict]:
+        duration_ms = call.get("duration_ms")
+        if duration_ms is None and call.get("start_timestamp") and call.get("end_timestamp"):
+            duration_ms = call["end_timestamp"] - call["start_timestamp"]
+        
+        call_details = {
+            "call_id": call.get("call_id"),
+            "agent_id": call.get("agent_id"),
+            "call_status": call.get("call_status"),
+            "transcript": call.get("transcript"),
+            "transcript_object": call.get("transcript_object"),
+            "recording_url": call.get("recording_url"),
+            "duration_ms": duration_ms,
+            "disconnection_reason": call.get("disconnection_reason"),
+            "call_analysis": call.get("call_analysis")
+        }
+        
+        missing = [field for field in CALL_DETAIL_FIELDS if call_details[field] is None]
+        if missing:
+            logger.debug(f"Call payload missing fields {missing}: {call_details['call_id']}")
+            return None
+        
+        return call_details
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from app.config import settings
+from app.database.client import get_supabase
+from app.models.conversation import ConversationStatus
+from app.services.conversation_service import ConversationService
+from app.services.lease_service import LeaseService
+from app.services.live_extraction_service import LIVE_CALL_STATUSES, forget_live_call
+from app.services.retell_service import RetellService
+from app.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+STALE_STATUSES = [ConversationStatus.PENDING.value, ConversationStatus.IN_PROGRESS.value, ConversationStatus.PROCESSING.value]
+FAILED_CALL_STATUSES = {"not_connected", "error"}
+SWEEPER_LEASE_KEY = "sweeper"
+
+class ConversationSweeper:
+    def __init__(self):
+        self.supabase = get_supabase()
+        self.retell_service = RetellService()
+        self.conversation_service = ConversationService()
+        self.lease_service = LeaseService()
+        self._finalize_queue: asyncio.Queue = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._finalizers: List[asyncio.Task] = []
+        self.stats: Dict = {
+            "runs": 0,
+            "last_run_at": None,
+            "last_duration_ms": None,
+            "last_checked": 0,
+            "last_enqueued": 0,
+            "last_failed": 0,
+            "checked_per_second": None,
+            "backlog": None,
+            "finalize_queue_size": 0,
+            "finalized_total": 0,
+            "finalize_errors_total": 0
+        }
+    
+    async def run(self) -> None:
+        logger.info(f"Starting conversation sweeper every {settings.sweeper_interval_seconds}s")
+        self._ensure_finalizers()
+        lease_ttl = int(settings.sweeper_interval_seconds * 2) + 1
+        try:
+            while True:
+                try:
+                    if await self.lease_service.try_acquire(SWEEPER_LEASE_KEY, lease_ttl):
+                        await self.sweep_once()
+                    else:
+                        logger.debug("Sweeper lease is held by another replica, skipping sweep")
+                except Exception as e:
+                    logger.error(f"Error sweeping stale conversations: {e}")
+                await asyncio.sleep(settings.sweeper_interval_seconds)
+        finally:
+            for task in self._finalizers:
+                task.cancel()
+            self._finalizers = []
+    
+    async def sweep_once(self) -> Dict:
+        started = time.monotonic()
+        cutoff = (datetime.utcnow() - timedelta(seconds=settings.sweeper_stale_after_seconds)).isoformat()
+        
+        result = self.supabase.table("conversations").select(
+            "id, status, retell_call_id, started_at, sweep_attempts", count="exact"
+        ).in_("status", STALE_STATUSES).lt("started_at", cutoff).order("last_swept_at", nullsfirst=True).order("started_at").limit(
+            settings.sweeper_batch_size
+        ).execute()
+        
+        semaphore = asyncio.Semaphore(settings.sweeper_check_concurrency)
+        outcomes = await asyncio.gather(*(self._check(conversation, semaphore) for conversation in result.data))
+        
+        duration = time.monotonic() - started
+        self.stats.update({
+            "runs": self.stats["runs"] + 1,
+            "last_run_at": datetime.utcnow().isoformat(),
+            "last_duration_ms": int(duration * 1000),
+            "last_checked": len(result.data),
+            "last_enqueued": outcomes.count("enqueued"),
+            "last_failed": outcomes.count("failed"),
+            "checked_per_second": round(len(result.data) / duration, 2) if duration > 0 else None,
+            "backlog": result.count,
+            "finalize_queue_size": self._finalize_queue.qsize()
+        })
+        logger.info(
+            f"Sweeper checked {len(result.data)} stale conversations in {self.stats['last_duration_ms']}ms "
+            f"({self.stats['last_enqueued']} enqueued, {self.stats['last_failed']} failed, backlog {result.count})"
+        )
+        return self.stats
+    
+    async def _check(self, conversation: Dict, semaphore: asyncio.Semaphore) -> Optional[str]:
+        outcome = await self._resolve(conversation, semaphore)
+        conversation_id = conversation["id"]
+        attempts = conversation.get("sweep_attempts") or 0
+        if outcome == "unknown":
+            attempts += 1
+            if attempts >= settings.sweeper_max_attempts:
+                logger.warning(f"Retell call status unknown after {attempts} sweeps, marking conversation failed: {conversation_id}")
+                await self.conversation_service.update_conversation_status(UUID(conversation_id), ConversationStatus.FAILED)
+                outcome = "failed"
+        if outcome == "failed":
+            if conversation.get("retell_call_id"):
+                forget_live_call(conversation["retell_call_id"])
+            return outcome
+        
+        try:
+            self.supabase.table("conversations").update({
+                "last_swept_at": datetime.utcnow().isoformat(),
+                "sweep_attempts": attempts
+            }).eq("id", conversation_id).execute()
+        except Exception as e:
+            logger.error(f"Sweeper failed to record check for conversation {conversation_id}: {e}")
+        return outcome if outcome == "enqueued" else None
+    
+    async def _resolve(self, conversation: Dict, semaphore: asyncio.Semaphore) -> Optional[str]:
+        conversation_id = conversation["id"]
+        call_id = conversation.get("retell_call_id")
+        
+        if not call_id:
+            logger.warning(f"Stale conversation has no Retell call, marking failed: {conversation_id}")
+            await self.conversation_service.update_conversation_status(UUID(conversation_id), ConversationStatus.FAILED)
+            return "failed"
+        
+        async with semaphore:
+            try:
+                call_details = await self.retell_service.get_call_details(call_id)
+            except Exception as e:
+                logger.error(f"Sweeper failed to check call {call_id}: {e}")
+                return None
+        
+        call_status = call_details.get("call_status")
+        if call_status == "ended":
+            return "enqueued" if self.enqueue_finalization(call_id) else None
+        if call_status in FAILED_CALL_STATUSES:
+            logger.warning(f"Retell call {call_id} is {call_status}, marking conversation failed: {conversation_id}")
+            await self.conversation_service.update_conversation_status(UUID(conversation_id), ConversationStatus.FAILED)
+            return "failed"
+        if call_status in LIVE_CALL_STATUSES:
+            return None
+        logger.warning(f"Retell call {call_id} has unknown status {call_status!r}: {conversation_id}")
+        return "unknown"
+    
+    def enqueue_finalization(self, call_id: str) -> bool:
+        if call_id in self._queued:
+            return False
+        self._ensure_finalizers()
+        self._queued.add(call_id)
+        self._finalize_queue.put_nowait(call_id)
+        return True
+    
+    def _ensure_finalizers(self) -> None:
+        self._finalizers = [task for task in self._finalizers if not task.done()]
+        while len(self._finalizers) < settings.sweeper_finalize_concurrency:
+            self._finalizers.append(asyncio.create_task(self._finalize_worker()))
+    
+    async def _finalize_worker(self) -> None:
+        webhook_service = WebhookService()
+        while True:
+            call_id = await self._finalize_queue.get()
+            try:
+                logger.info(f"Sweeper finalizing ended call: {call_id}")
+                await webhook_service.dispatch_call_ended({"call_id": call_id})
+                self.stats["finalized_total"] += 1
+            except Exception as e:
+                logger.error(f"Sweeper failed to finalize call {call_id}: {e}")
+                self.stats["finalize_errors_total"] += 1
+            finally:
+                self._queued.discard(call_id)
+                self._finalize_queue.task_done()
+                self.stats["finalize_queue_size"] = self._finalize_queue.qsize()
+
+_sweeper: ConversationSweeper = None
+
+def get_conversation_sweeper() -> ConversationSweeper:
+    global _sweeper
+    if _sweeper is None:
+        _sweeper = ConversationSweeper()
+    return _sweeper
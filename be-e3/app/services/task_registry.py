@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from typing import Callable, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class _TrackedTask:
+    def __init__(self, name: str, on_unfinished: Optional[Callable[[], None]]):
+        self.name = name
+        self.on_unfinished = on_unfinished
+
+class TaskRegistry:
+    def __init__(self):
+        self._tasks: Dict[asyncio.Task, _TrackedTask] = {}
+        self.accepting = True
+    
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+    
+    def spawn(self, name: str, coro: Coroutine, on_unfinished: Optional[Callable[[], None]] = None) -> bool:
+        if not self.accepting:
+            coro.close()
+            logger.warning(f"Shutting down, not starting background task: {name}")
+            return False
+        
+        task = asyncio.create_task(coro, name=name)
+        self._tasks[task] = _TrackedTask(name, on_unfinished)
+        task.add_done_callback(self._done)
+        return True
+    
+    def _done(self, task: asyncio.Task) -> None:
+        tracked = self._tasks.pop(task, None)
+        if tracked and not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background task {tracked.name} failed: {task.exception()}")
+    
+    async def drain(self, timeout: float) -> None:
+        self.accepting = False
+        if not self._tasks:
+            return
+        
+        logger.info(f"Draining {len(self._tasks)} background tasks for up to {timeout}s")
+        done, pending = await asyncio.wait(list(self._tasks), timeout=timeout)
+        if not pending:
+            logger.info("All background tasks drained")
+            return
+        
+        unfinished = [self._tasks[task] for task in pending if task in self._tasks]
+        logger.warning(f"{len(unfinished)} background tasks did not finish before the deadline, cancelling them")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        for tracked in unfinished:
+            if tracked.on_unfinished is None:
+                continue
+            try:
+                tracked.on_unfinished()
+                logger.info(f"Persisted unfinished background task for resumption: {tracked.name}")
+            except Exception as e:
+                logger.error(f"Failed to persist unfinished background task {tracked.name}: {e}")
+
+_registry: TaskRegistry = None
+
+def get_task_registry() -> TaskRegistry:
+    global _registry
+    if _registry is None:
+        _registry = TaskRegistry()
+    return _registry
@@ -0,0 +1,52 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+def _field(item: Any, name: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+def _milliseconds(seconds: Any) -> Optional[int]:
+    if seconds is None:
+        return None
+    return int(round(float(seconds) * 1000))
+
+def encode_transcript(transcript_object: List[Any]) -> List[Dict]:
+    utterances = []
+    for item in transcript_object or []:
+        role, content = _field(item, "role"), _field(item, "content")
+        if not content:
+            continue
+        words = [
+            [_field(word, "word"), _milliseconds(_field(word, "start")), _milliseconds(_field(word, "end"))]
+            for word in _field(item, "words") or []
+        ]
+        utterances.append({
+            "role": "agent" if role == "agent" else "human",
+            "content": content,
+            "start_ms": words[0][1] if words else None,
+            "end_ms": words[-1][2] if words else None,
+            "words": words
+        })
+    return utterances
+
+def utterance_created_at(started_at: Any, start_ms: Optional[int]) -> datetime:
+    if isinstance(started_at, str):
+        started_at = datetime.fromisoformat(started_at)
+    return started_at + timedelta(milliseconds=start_ms or 0)
+
+def utterance_message(conversation_id: Any, row: Dict, include_words: bool = False) -> Dict:
+    message = {
+        "id": uuid.uuid5(uuid.UUID(str(conversation_id)), str(row["seq"])),
+        "conversation_id": conversation_id,
+        "role": row["role"],
+        "content": row["content"],
+        "created_at": row["created_at"],
+        "seq": row["seq"],
+        "start_ms": row.get("start_ms"),
+        "end_ms": row.get("end_ms")
+    }
+    if include_words and row.get("words") is not None:
+        message["words"] = [{"word": word, "start_ms": start, "end_ms": end} for word, start, end in row["words"]]
+    return message
@@ -1,12 +1,20 @@
+import asyncio
 import logging
-from typing import Dict
+from typing import Dict, List
 from uuid import UUID
 from app.services.retell_service import RetellService
 from app.services.conversation_service import ConversationService
 from app.services.agent_service import AgentService
 from app.services.post_processing_service import PostProcessingService
+from app.services.live_extraction_service import LiveExtractionService, utterance_parts
+from app.services.transcript_store import encode_transcript
+from app.services.lease_service import LeaseService
+from app.services.job_queue_service import JobQueueService, CALL_ENDED_JOB
+from app.services.task_registry import get_task_registry
+from app.services.extracted_fields import detect_emergency, materialize_fields
 from app.models.conversation import ConversationStatus
 from app.models.message import MessageCreate, MessageRole
+from app.config import settings
 from app.database.client import get_supabase
 
 logger = logging.getLogger(__name__)
@@ -17,6 +25,9 @@ class WebhookService:
         self.conversation_service = ConversationService()
         self.agent_service = AgentService()
         self.post_processing_service = PostProcessingService()
+        self.live_extraction_service = LiveExtractionService()
+        self.lease_service = LeaseService()
+        self.job_queue_service = JobQueueService()
         self.supabase = get_supabase()
     
     async def process_webhook(self, event_type: str, payload: Dict) -> None:
@@ -25,36 +36,64 @@ class WebhookService:
         if event_type == "call_started":
             await self.handle_call_started(payload)
         elif event_type == "call_ended":
-            await self.handle_call_ended(payload)
+            await self.dispatch_call_ended(payload, background=True)
         elif event_type == "call_analyzed":
             await self.handle_call_analyzed(payload)
+        elif event_type == "transcript_updated":
+            await self.handle_transcript_updated(payload)
         else:
             logger.warning(f"Unknown webhook event type: {event_type}")
     
     async def handle_call_started(self, payload: Dict) -> None:
-        call_id = payload.get("call_id")
+        call_id = self._call_data(payload).get("call_id")
         logger.info(f"Handling call_started webhook: {call_id}")
         
-        conversation = self.supabase.table("conversations").select("*").eq(
+        conversation = self.supabase.table("conversations").select("id").eq(
             "retell_call_id", call_id
         ).execute()
         
         if conversation.data:
             conversation_id = UUID(conversation.data[0]["id"])
-            await self.conversation_service.update_conversation_status(
+            if await self.conversation_service.transition_status(
                 conversation_id,
-                ConversationStatus.IN_PROGRESS
-            )
-            logger.info(f"Updated conversation status to IN_PROGRESS: {conversation_id}")
+                ConversationStatus.IN_PROGRESS,
+                from_statuses=[ConversationStatus.PENDING]
+            ):
+                logger.info(f"Updated conversation status to IN_PROGRESS: {conversation_id}")
         else:
             logger.warning(f"No conversation found for call_id: {call_id}")
     
+    async def dispatch_call_ended(self, payload: Dict, background: bool = False) -> None:
+        call = self._call_data(payload)
+        call_id = call.get("call_id")
+        
+        if settings.processing_mode == "worker":
+            self.retell_service.invalidate_call_details(call_id)
+            self.enqueue_call_ended(call)
+            return
+        
+        if not background:
+            await self.handle_call_ended(payload)
+            return
+        
+        if not get_task_registry().spawn(
+            f"call_ended:{call_id}",
+            self.handle_call_ended(payload),
+            on_unfinished=lambda: self.enqueue_call_ended(call)
+        ):
+            self.enqueue_call_ended(call)
+    
+    def enqueue_call_ended(self, call: Dict) -> None:
+        self.job_queue_service.enqueue(CALL_ENDED_JOB, call.get("call_id"), {"call": call})
+    
     async def handle_call_ended(self, payload: Dict) -> None:
-        call_id = payload.get("call_id")
+        call = self._call_data(payload)
+        call_id = call.get("call_id")
         logger.info(f"Handling call_ended webhook: {call_id}")
+        self.retell_service.invalidate_call_details(call_id)
         
         try:
-            conversation_result = self.supabase.table("conversations").select("*").eq(
+            conversation_result = self.supabase.table("conversations").select("id").eq(
                 "retell_call_id", call_id
             ).execute()
             
@@ -62,89 +101,151 @@ class WebhookService:
                 logger.warning(f"No conversation found for call_id: {call_id}")
                 return
             
-            conversation = conversation_result.data[0]
-            conversation_id = UUID(conversation["id"])
-            logger.info(f"Processing call end for conversation: {conversation_id}")
-            
+            conversation_id = UUID(conversation_result.data[0]["id"])
+            async with self.lease_service.hold(f"conversation:{conversation_id}") as acquired:
+                if not acquired:
+                    logger.info(f"Call end is being processed by another worker: {conversation_id}")
+                    return
+                try:
+                    await self._process_call_ended(call, call_id, conversation_id)
+                except (asyncio.CancelledError, Exception) as e:
+                    logger.warning(f"Call end processing interrupted ({type(e).__name__}), returning conversation to in_progress: {conversation_id}")
+                    await self.conversation_service.transition_status(
+                        conversation_id,
+                        ConversationStatus.IN_PROGRESS,
+                        from_statuses=[ConversationStatus.PROCESSING]
+                    )
+                    raise
+        except Exception as e:
+            logger.error(f"Error handling call_ended webhook: {e}")
+            raise
+    
+    async def _process_call_ended(self, call: Dict, call_id: str, conversation_id: UUID) -> None:
+        conversation = await self.conversation_service.transition_status(
+            conversation_id,
+            ConversationStatus.PROCESSING,
+            from_statuses=[ConversationStatus.PENDING, ConversationStatus.IN_PROGRESS],
+            reclaim_processing_after_seconds=settings.processing_stale_after_seconds
+        )
+        if conversation is None:
+            logger.info(f"Call end already processed or being processed: {conversation_id}")
+            return
+        
+        logger.info(f"Processing call end for conversation: {conversation_id}")
+        
+        call_details = self.retell_service.call_details_from_payload(call)
+        if call_details is None:
+            logger.info(f"Call payload incomplete, retrieving call details: {call_id}")
             call_details = await self.retell_service.get_call_details(call_id)
+        
+        call_analysis = call_details.get("call_analysis")
+        if call_analysis and not isinstance(call_analysis, dict):
+            if hasattr(call_analysis, 'model_dump'):
+                call_analysis = call_analysis.model_dump()
+            elif hasattr(call_analysis, 'dict'):
+                call_analysis = call_analysis.dict()
+            else:
+                call_analysis = None
+        
+        transcript_object = call_details.get("transcript_object") or []
+        compact = settings.transcript_storage_mode == "compact"
+        details = {
+            "transcript": call_details.get("transcript"),
+            "recording_url": call_details.get("recording_url"),
+            "duration_ms": call_details.get("duration_ms"),
+            "disconnection_reason": call_details.get("disconnection_reason"),
+            "call_analysis": call_analysis
+        }
+        if compact:
+            compact_utterances = encode_transcript(transcript_object)
+            details["transcript_utterances"] = compact_utterances
+            details["utterance_count"] = len(compact_utterances)
+        
+        try:
+            self.supabase.table("conversations").update(details).eq("id", str(conversation_id)).execute()
+            logger.info(f"Updated conversation with call details: {conversation_id}")
+        except Exception as e:
+            logger.error(f"Error updating conversation with call details: {e}")
+            if compact:
+                raise
+        
+        if not compact:
+            await self._insert_messages(conversation_id, transcript_object)
+        
+        try:
+            agent = await self.agent_service.get_agent(UUID(conversation["agent_id"]))
             
-            call_analysis = call_details.get("call_analysis")
-            if call_analysis and not isinstance(call_analysis, dict):
-                if hasattr(call_analysis, 'model_dump'):
-                    call_analysis = call_analysis.model_dump()
-                elif hasattr(call_analysis, 'dict'):
-                    call_analysis = call_analysis.dict()
-                else:
-                    call_analysis = None
-            
-            try:
-                self.supabase.table("conversations").update({
-                    "transcript": call_details.get("transcript"),
-                    "recording_url": call_details.get("recording_url"),
-                    "duration_ms": call_details.get("duration_ms"),
-                    "disconnection_reason": call_details.get("disconnection_reason"),
-                    "call_analysis": call_analysis
-                }).eq("id", str(conversation_id)).execute()
-                logger.info(f"Updated conversation with call details: {conversation_id}")
-            except Exception as e:
-                logger.error(f"Error updating conversation with call details: {e}")
+            logger.info(f"Extracting structured data for conversation: {conversation_id}")
+            self.live_extraction_service.forget(call_id)
+            structured_data = await self.live_extraction_service.finalize(
+                conversation=conversation,
+                transcript_object=transcript_object or [],
+                transcript=call_details.get("transcript", ""),
+                scenario_description=agent.prompts,
+                extraction_schema=await self.agent_service.ensure_extraction_schema(agent.model_dump())
+            )
+            logger.info(f"Extracted structured data for conversation: {conversation_id}")
             
-            transcript_object = call_details.get("transcript_object", [])
-            for msg in transcript_object:
-                try:
-                    if isinstance(msg, dict):
-                        msg_role = msg.get("role")
-                        msg_content = msg.get("content", "")
-                    else:
-                        msg_role = getattr(msg, "role", None)
-                        msg_content = getattr(msg, "content", "")
-                    
-                    role = MessageRole.AGENT if msg_role == "agent" else MessageRole.HUMAN
-                    
-                    if msg_content:
-                        await self.conversation_service.add_message(
-                            MessageCreate(
-                                conversation_id=conversation_id,
-                                role=role,
-                                content=msg_content
-                            )
-                        )
-                except Exception as e:
-                    logger.error(f"Error adding message to conversation: {e}")
-                    continue
+            await self.conversation_service.transition_status(
+                conversation_id,
+                ConversationStatus.COMPLETED,
+                from_statuses=[ConversationStatus.PROCESSING],
+                extra={
+                    "structured_data": structured_data,
+                    **materialize_fields(structured_data),
+                    "emergency_detected": bool(conversation.get("emergency_detected")) or detect_emergency(structured_data)
+                }
+            )
             
+            logger.info(f"Successfully processed call_ended for conversation: {conversation_id}")
+        except Exception as e:
+            logger.error(f"Error extracting structured data: {e}")
+            await self.conversation_service.transition_status(
+                conversation_id,
+                ConversationStatus.COMPLETED,
+                from_statuses=[ConversationStatus.PROCESSING]
+            )
+    
+    async def _insert_messages(self, conversation_id: UUID, transcript_object: List) -> None:
+        utterances = [utterance_parts(msg) for msg in transcript_object]
+        utterances = [(msg_role, msg_content) for msg_role, msg_content in utterances if msg_content]
+        
+        stored = await self.conversation_service.next_message_seq(conversation_id)
+        if stored:
+            logger.info(f"Resuming message insert at seq {stored}: {conversation_id}")
+        
+        for seq, (msg_role, msg_content) in enumerate(utterances[stored:], start=stored):
             try:
-                agent = await self.agent_service.get_agent(UUID(conversation["agent_id"]))
-                
-                logger.info(f"Extracting structured data for conversation: {conversation_id}")
-                structured_data = await self.post_processing_service.extract_structured_data(
-                    transcript=call_details.get("transcript", ""),
-                    scenario_description=agent.prompts
+                role = MessageRole.AGENT if msg_role == "agent" else MessageRole.HUMAN
+                await self.conversation_service.add_message(
+                    MessageCreate(
+                        conversation_id=conversation_id,
+                        role=role,
+                        content=msg_content,
+                        seq=seq
+                    )
                 )
-                logger.info(f"Extracted structured data for conversation: {conversation_id}")
-                
-                self.supabase.table("conversations").update({
-                    "structured_data": structured_data,
-                    "status": ConversationStatus.COMPLETED.value
-                }).eq("id", str(conversation_id)).execute()
-                
-                logger.info(f"Successfully processed call_ended for conversation: {conversation_id}")
             except Exception as e:
-                logger.error(f"Error extracting structured data: {e}")
-                self.supabase.table("conversations").update({
-                    "status": ConversationStatus.COMPLETED.value
-                }).eq("id", str(conversation_id)).execute()
-                
-        except Exception as e:
-            logger.error(f"Error handling call_ended webhook: {e}")
-            raise
+                logger.error(f"Error adding message {seq} to conversation {conversation_id}, stopping insert: {e}")
+                raise
+    
+    async def handle_transcript_updated(self, payload: Dict) -> None:
+        call = self._call_data(payload)
+        call_id = call.get("call_id")
+        logger.debug(f"Handling transcript_updated webhook: {call_id}")
+        
+        if call_id:
+            self.live_extraction_service.submit(call_id, call.get("transcript_object") or [])
     
     async def handle_call_analyzed(self, payload: Dict) -> None:
-        call_id = payload.get("call_id")
-        call_analysis = payload.get("call_analysis")
+        call = self._call_data(payload)
+        call_id = call.get("call_id")
+        call_analysis = call.get("call_analysis")
         
         if call_analysis:
             self.supabase.table("conversations").update({
                 "call_analysis": call_analysis
             }).eq("retell_call_id", call_id).execute()
-
+    
+    def _call_data(self, payload: Dict) -> Dict:
+        return payload.get("call") or payload
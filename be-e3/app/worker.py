@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import logging
+import signal
+from contextlib import suppress
+from typing import Dict
+from app.config import settings
+from app.services.job_queue_service import JobQueueService, CALL_ENDED_JOB
+from app.services.lease_service import LEASE_OWNER
+from app.services.webhook_service import WebhookService
+
+logger = logging.getLogger(__name__)
+
+class Worker:
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.worker_id = LEASE_OWNER
+        self.job_queue_service = JobQueueService()
+        self.webhook_service = WebhookService()
+        self.handlers = {
+            CALL_ENDED_JOB: self.webhook_service.handle_call_ended
+        }
+        self._running: Dict[asyncio.Task, Dict] = {}
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+    
+    def stop(self) -> None:
+        if not self._stopping.is_set():
+            logger.info("Worker stopping, no new jobs will be claimed")
+        self._stopping.set()
+        self._wakeup.set()
+    
+    async def run(self) -> None:
+        logger.info(f"Worker {self.worker_id} started with concurrency {self.concurrency}")
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            free = self.concurrency - len(self._running)
+            if free > 0:
+                try:
+                    for job in self.job_queue_service.claim(self.worker_id, free):
+                        self._start(job)
+                except Exception as e:
+                    logger.error(f"Error claiming jobs: {e}")
+            
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), settings.worker_poll_interval_seconds)
+        
+        await self.drain()
+        logger.info(f"Worker {self.worker_id} stopped")
+    
+    async def drain(self) -> None:
+        if not self._running:
+            return
+        
+        logger.info(f"Draining {len(self._running)} in-flight jobs for up to {settings.worker_drain_timeout_seconds}s")
+        done, pending = await asyncio.wait(list(self._running), timeout=settings.worker_drain_timeout_seconds)
+        if not pending:
+            return
+        
+        unfinished = [self._running[task] for task in pending]
+        logger.warning(f"{len(unfinished)} jobs did not finish before the drain deadline, releasing them")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        for job in unfinished:
+            try:
+                self.job_queue_service.release(job)
+            except Exception as e:
+                logger.error(f"Failed to release job {job['id']}: {e}")
+    
+    def _start(self, job: Dict) -> None:
+        task = asyncio.create_task(self._run_job(job))
+        self._running[task] = job
+        task.add_done_callback(self._finished)
+    
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.pop(task, None)
+        self._wakeup.set()
+    
+    async def _run_job(self, job: Dict) -> None:
+        logger.info(f"Running {job['kind']} job for call {job['call_id']} (attempt {job['attempts']})")
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            await handler(job.get("payload") or {})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"{job['kind']} job for call {job['call_id']} failed: {e}")
+            self.job_queue_service.fail(job, str(e))
+            return
+        
+        self.job_queue_service.complete(job)
+        logger.info(f"Completed {job['kind']} job for call {job['call_id']}")
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Process queued call processing jobs outside the API process")
+    parser.add_argument("--concurrency", type=int, default=None)
+    args = parser.parse_args()
+    
+    worker = Worker(args.concurrency or settings.worker_concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
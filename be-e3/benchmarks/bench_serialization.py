@@ -0,0 +1,106 @@
+import argparse
+import gzip
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, List
+import brotli
+import orjson
+from pydantic import TypeAdapter
+from app.models.conversation import ConversationListResponse, ConversationResponse, ConversationStatus
+
+def make_conversation_list(rows: int) -> List[ConversationListResponse]:
+    now = datetime.now(timezone.utc)
+    return [
+        ConversationListResponse(
+            id=uuid.uuid4(),
+            agent_id=uuid.uuid4(),
+            agent_name=f"Dispatch Agent {i % 20}",
+            driver_id=uuid.uuid4(),
+            driver_name=f"Driver {i}",
+            load_number=f"LOAD-{100000 + i}",
+            status=ConversationStatus.COMPLETED,
+            started_at=now,
+            completed_at=now
+        )
+        for i in range(rows)
+    ]
+
+def make_conversation(utterances: int) -> ConversationResponse:
+    now = datetime.now(timezone.utc)
+    lines = []
+    for i in range(utterances):
+        if i % 2 == 0:
+            lines.append(f"Agent: Thanks, can you confirm your location and ETA for load LOAD-{i}?")
+        else:
+            lines.append(f"User: I'm near mile marker {100 + i} on I-40, should be there around {i % 12 + 1} PM.")
+    return ConversationResponse(
+        id=uuid.uuid4(),
+        agent_id=uuid.uuid4(),
+        driver_id=uuid.uuid4(),
+        load_number="LOAD-123456",
+        status=ConversationStatus.COMPLETED,
+        started_at=now,
+        completed_at=now,
+        retell_call_id="call_" + uuid.uuid4().hex,
+        recording_url="https://example.com/recording.wav",
+        transcript="\n".join(lines),
+        duration_ms=utterances * 4000,
+        structured_data={
+            "call_outcome": "In-Transit Update",
+            "driver_status": "Driving",
+            "current_location": "I-40 near mile marker 142",
+            "eta": "Tomorrow, 8:00 AM",
+            "delay_reason": None,
+            "pod_reminder_acknowledged": True
+        }
+    )
+
+def stdlib_json(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+def orjson_dumps(content) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def time_per_call(fn: Callable, payload, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    return (time.perf_counter() - start) / iterations
+
+def report(name: str, adapter: TypeAdapter, payload, iterations: int) -> None:
+    payload = adapter.dump_python(payload, mode="json")
+    std_time = time_per_call(stdlib_json, payload, iterations)
+    orjson_time = time_per_call(orjson_dumps, payload, iterations)
+    body = orjson_dumps(payload)
+    gzip_size = len(gzip.compress(body, compresslevel=6))
+    brotli_size = len(brotli.compress(body, quality=4))
+    
+    print(f"{name}")
+    print(f"  json:   {std_time * 1000:8.3f} ms/response")
+    print(f"  orjson: {orjson_time * 1000:8.3f} ms/response ({std_time / orjson_time:.1f}x)")
+    print(f"  bytes:  {len(body)} raw, {gzip_size} gzip ({gzip_size / len(body):.0%}), {brotli_size} br ({brotli_size / len(body):.0%})")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serialization CPU and response size benchmark")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--utterances", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    
+    report(
+        f"list_conversations ({args.rows} rows)",
+        TypeAdapter(List[ConversationListResponse]),
+        make_conversation_list(args.rows),
+        args.iterations
+    )
+    report(
+        f"get_conversation ({args.utterances} utterances)",
+        TypeAdapter(ConversationResponse),
+        make_conversation(args.utterances),
+        args.iterations
+    )
+
+if __name__ == "__main__":
+    main()
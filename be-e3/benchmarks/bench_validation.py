@@ -0,0 +1,56 @@
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+from pydantic import TypeAdapter
+from app.models.message import MessageResponse
+
+MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageResponse])
+
+def make_rows(count: int) -> List[Dict]:
+    conversation_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "conversation_id": conversation_id,
+            "role": "agent" if i % 2 == 0 else "human",
+            "content": f"Utterance {i}: I'm near mile marker {100 + i}, about two hours out.",
+            "created_at": now
+        }
+        for i in range(count)
+    ]
+
+def per_row_and_revalidate(rows: List[Dict]) -> bytes:
+    messages = [MessageResponse(**row) for row in rows]
+    content = [message.model_dump() for message in messages]
+    validated = MESSAGE_LIST_ADAPTER.validate_python(content)
+    return json.dumps(MESSAGE_LIST_ADAPTER.dump_python(validated, mode="json")).encode()
+
+def bulk_validate_once(rows: List[Dict]) -> bytes:
+    return MESSAGE_LIST_ADAPTER.dump_json(MESSAGE_LIST_ADAPTER.validate_python(rows))
+
+def rows_per_second(fn: Callable, rows: List[Dict], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(rows)
+    return len(rows) * iterations / (time.perf_counter() - start)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rows per second for DB row validation and response serialization")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    
+    rows = make_rows(args.rows)
+    baseline = rows_per_second(per_row_and_revalidate, rows, args.iterations)
+    fast = rows_per_second(bulk_validate_once, rows, args.iterations)
+    
+    print(f"messages ({args.rows} rows)")
+    print(f"  Model(**row) + response_model: {baseline:12,.0f} rows/s")
+    print(f"  TypeAdapter bulk, no revalidate: {fast:10,.0f} rows/s ({fast / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    main()
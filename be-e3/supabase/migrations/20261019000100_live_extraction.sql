@@ -0,0 +1,3 @@
+alter table conversations
+    add column if not exists live_transcript_cursor integer not null default 0,
+    add column if not exists emergency_detected boolean not null default false;
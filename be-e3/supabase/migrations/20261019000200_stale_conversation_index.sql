@@ -0,0 +1,3 @@
+create index if not exists conversations_active_started_at_idx
+    on conversations (started_at)
+    where status in ('pending', 'in_progress');
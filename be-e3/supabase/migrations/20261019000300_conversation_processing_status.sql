@@ -0,0 +1,16 @@
+do $$
+begin
+    if exists (
+        select 1 from pg_type t
+        join pg_attribute a on a.atttypid = t.oid
+        where a.attrelid = 'conversations'::regclass and a.attname = 'status' and t.typtype = 'e'
+    ) then
+        execute format(
+            'alter type %s add value if not exists %L',
+            (select t.typname from pg_type t
+             join pg_attribute a on a.atttypid = t.oid
+             where a.attrelid = 'conversations'::regclass and a.attname = 'status'),
+            'processing'
+        );
+    end if;
+end $$;
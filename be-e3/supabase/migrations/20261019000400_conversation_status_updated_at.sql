@@ -0,0 +1,7 @@
+alter table conversations
+    add column if not exists status_updated_at timestamptz not null default now();
+
+drop index if exists conversations_active_started_at_idx;
+create index conversations_active_started_at_idx
+    on conversations (started_at)
+    where status in ('pending', 'in_progress', 'processing');
@@ -0,0 +1,38 @@
+create table if not exists work_leases (
+    key text primary key,
+    owner text not null,
+    expires_at timestamptz not null,
+    acquired_at timestamptz not null default now()
+);
+
+create index if not exists work_leases_expires_at_idx on work_leases (expires_at);
+
+create or replace function acquire_lease(p_key text, p_owner text, p_ttl_seconds integer)
+returns boolean
+language plpgsql
+as $$
+declare
+    acquired boolean;
+begin
+    insert into work_leases as l (key, owner, expires_at, acquired_at)
+    values (p_key, p_owner, now() + make_interval(secs => p_ttl_seconds), now())
+    on conflict (key) do update
+        set owner = excluded.owner,
+            expires_at = excluded.expires_at,
+            acquired_at = case when l.owner = excluded.owner then l.acquired_at else now() end
+        where l.expires_at < now() or l.owner = excluded.owner
+    returning true into acquired;
+
+    return coalesce(acquired, false);
+end;
+$$;
+
+create or replace function release_lease(p_key text, p_owner text)
+returns boolean
+language plpgsql
+as $$
+begin
+    delete from work_leases where key = p_key and owner = p_owner;
+    return found;
+end;
+$$;
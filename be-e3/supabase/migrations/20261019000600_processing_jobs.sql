@@ -0,0 +1,60 @@
+create table if not exists processing_jobs (
+    id uuid primary key default gen_random_uuid(),
+    kind text not null,
+    call_id text not null,
+    payload jsonb not null default '{}'::jsonb,
+    status text not null default 'queued' check (status in ('queued', 'running', 'done', 'failed')),
+    attempts integer not null default 0,
+    available_at timestamptz not null default now(),
+    locked_by text,
+    locked_until timestamptz,
+    last_error text,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);
+
+create unique index if not exists processing_jobs_active_call_idx
+    on processing_jobs (kind, call_id)
+    where status in ('queued', 'running');
+
+create index if not exists processing_jobs_claim_idx
+    on processing_jobs (available_at)
+    where status in ('queued', 'running');
+
+create or replace function enqueue_processing_job(p_kind text, p_call_id text, p_payload jsonb)
+returns boolean
+language plpgsql
+as $$
+begin
+    insert into processing_jobs (kind, call_id, payload)
+    values (p_kind, p_call_id, coalesce(p_payload, '{}'::jsonb))
+    on conflict (kind, call_id) where status in ('queued', 'running') do nothing;
+
+    return found;
+end;
+$$;
+
+create or replace function claim_processing_jobs(p_worker text, p_limit integer, p_lock_seconds integer)
+returns setof processing_jobs
+language plpgsql
+as $$
+begin
+    return query
+    update processing_jobs j
+    set status = 'running',
+        attempts = j.attempts + 1,
+        locked_by = p_worker,
+        locked_until = now() + make_interval(secs => p_lock_seconds),
+        updated_at = now()
+    where j.id in (
+        select id
+        from processing_jobs
+        where (status = 'queued' and available_at <= now())
+           or (status = 'running' and locked_until < now())
+        order by available_at
+        limit p_limit
+        for update skip locked
+    )
+    returning j.*;
+end;
+$$;
@@ -0,0 +1,73 @@
+alter table conversations
+    add column if not exists transcript_tsv tsvector
+    generated always as (to_tsvector('english', coalesce(transcript, ''))) stored;
+
+alter table messages
+    add column if not exists content_tsv tsvector
+    generated always as (to_tsvector('english', coalesce(content, ''))) stored;
+
+create index if not exists conversations_transcript_tsv_idx on conversations using gin (transcript_tsv);
+create index if not exists messages_content_tsv_idx on messages using gin (content_tsv);
+
+create or replace function search_conversations(p_query text, p_limit integer, p_offset integer)
+returns table (
+    id uuid,
+    load_number text,
+    status text,
+    started_at timestamptz,
+    agent_name text,
+    driver_name text,
+    rank real,
+    snippet text,
+    total bigint
+)
+language sql
+stable
+as $$
+    with q as (
+        select websearch_to_tsquery('english', p_query) as query
+    ),
+    hits as (
+        select c.id as conversation_id, ts_rank_cd(c.transcript_tsv, q.query) as rank, null::uuid as message_id
+        from conversations c, q
+        where c.transcript_tsv @@ q.query
+        union all
+        select m.conversation_id, ts_rank_cd(m.content_tsv, q.query), m.id
+        from messages m, q
+        where m.content_tsv @@ q.query
+    ),
+    ranked as (
+        select
+            conversation_id,
+            max(rank) as rank,
+            (array_agg(message_id order by rank desc) filter (where message_id is not null))[1] as best_message_id,
+            count(*) over () as total
+        from hits
+        group by conversation_id
+        order by max(rank) desc, conversation_id
+        limit p_limit
+        offset p_offset
+    )
+    select
+        c.id,
+        c.load_number,
+        c.status::text,
+        c.started_at,
+        a.name,
+        d.name,
+        r.rank,
+        ts_headline(
+            'english',
+            coalesce(case when c.transcript_tsv @@ q.query then c.transcript end, m.content, ''),
+            q.query,
+            'StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=5'
+        ),
+        r.total
+    from ranked r
+    cross join q
+    join conversations c on c.id = r.conversation_id
+    left join agents a on a.id = c.agent_id
+    left join drivers d on d.id = c.driver_id
+    left join messages m on m.id = r.best_message_id
+    order by r.rank desc, c.started_at desc;
+$$;
@@ -0,0 +1,44 @@
+alter table conversations
+    add column if not exists call_outcome text,
+    add column if not exists emergency_type text,
+    add column if not exists eta text,
+    add column if not exists is_load_secure boolean,
+    add column if not exists customer text,
+    add column if not exists detention_minutes integer;
+
+update conversations
+set
+    call_outcome = nullif(trim(both '_' from regexp_replace(lower(structured_data->>'call_outcome'), '[^a-z0-9]+', '_', 'g')), ''),
+    emergency_type = nullif(trim(both '_' from regexp_replace(lower(structured_data->>'emergency_type'), '[^a-z0-9]+', '_', 'g')), ''),
+    eta = nullif(trim(structured_data->>'eta'), ''),
+    is_load_secure = case
+        when lower(trim(structured_data->>'is_load_secure')) in ('true', 'yes', 'y', 'secure', 'secured') then true
+        when lower(trim(structured_data->>'is_load_secure')) in ('false', 'no', 'n', 'not secure', 'unsecured', 'insecure') then false
+    end,
+    customer = nullif(trim(structured_data->>'customer'), ''),
+    detention_minutes = substring(structured_data->>'detention_minutes' from '-?\d+(?:\.\d+)?')::numeric::integer
+where structured_data is not null
+  and not structured_data ? 'error';
+
+update conversations
+set emergency_detected = true
+where not coalesce(emergency_detected, false)
+  and structured_data is not null
+  and not structured_data ? 'error'
+  and (lower(structured_data->>'emergency_detected') in ('true', 'yes') or emergency_type is not null);
+
+create index if not exists conversations_call_outcome_started_at_idx
+    on conversations (call_outcome, started_at desc)
+    where call_outcome is not null;
+
+create index if not exists conversations_emergency_type_started_at_idx
+    on conversations (emergency_type, started_at desc)
+    where emergency_type is not null;
+
+create index if not exists conversations_customer_started_at_idx
+    on conversations (customer, started_at desc)
+    where customer is not null;
+
+create index if not exists conversations_emergency_started_at_idx
+    on conversations (started_at desc)
+    where emergency_detected;
@@ -0,0 +1,170 @@
+create table if not exists conversation_rollups (
+    bucket_start timestamptz not null,
+    agent_id uuid not null,
+    driver_id uuid not null,
+    calls integer not null default 0,
+    completed integer not null default 0,
+    failed integer not null default 0,
+    emergencies integer not null default 0,
+    duration_ms_sum bigint not null default 0,
+    duration_count integer not null default 0,
+    extraction_attempts integer not null default 0,
+    extraction_successes integer not null default 0,
+    outcome_counts jsonb not null default '{}'::jsonb,
+    updated_at timestamptz not null default now(),
+    primary key (bucket_start, agent_id, driver_id)
+);
+
+create index if not exists conversation_rollups_agent_bucket_idx on conversation_rollups (agent_id, bucket_start);
+create index if not exists conversation_rollups_driver_bucket_idx on conversation_rollups (driver_id, bucket_start);
+
+create table if not exists conversation_rollup_log (
+    conversation_id uuid primary key,
+    recorded_at timestamptz not null default now()
+);
+
+create or replace function record_conversation_rollup(p_conversation_id uuid)
+returns boolean
+language plpgsql
+as $$
+declare
+    c record;
+    outcome text;
+    extracted boolean;
+begin
+    select id, agent_id, driver_id, status::text as status, started_at, duration_ms, emergency_detected, emergency_type, call_outcome, structured_data
+    into c
+    from conversations
+    where id = p_conversation_id and status in ('completed', 'failed');
+
+    if not found then
+        return false;
+    end if;
+
+    insert into conversation_rollup_log (conversation_id) values (c.id)
+    on conflict (conversation_id) do nothing;
+    if not found then
+        return false;
+    end if;
+
+    outcome := coalesce(c.call_outcome, 'unknown');
+    extracted := c.structured_data is not null and jsonb_typeof(c.structured_data) = 'object' and not c.structured_data ? 'error';
+
+    insert into conversation_rollups as r (
+        bucket_start, agent_id, driver_id, calls, completed, failed, emergencies,
+        duration_ms_sum, duration_count, extraction_attempts, extraction_successes, outcome_counts
+    )
+    values (
+        date_trunc('hour', c.started_at),
+        c.agent_id,
+        c.driver_id,
+        1,
+        (c.status = 'completed')::int,
+        (c.status = 'failed')::int,
+        coalesce(c.emergency_detected or c.emergency_type is not null or lower(c.structured_data->>'emergency_detected') in ('true', 'yes'), false)::int,
+        coalesce(c.duration_ms, 0),
+        (c.duration_ms is not null)::int,
+        (c.status = 'completed')::int,
+        (c.status = 'completed' and extracted)::int,
+        jsonb_build_object(outcome, 1)
+    )
+    on conflict (bucket_start, agent_id, driver_id) do update set
+        calls = r.calls + excluded.calls,
+        completed = r.completed + excluded.completed,
+        failed = r.failed + excluded.failed,
+        emergencies = r.emergencies + excluded.emergencies,
+        duration_ms_sum = r.duration_ms_sum + excluded.duration_ms_sum,
+        duration_count = r.duration_count + excluded.duration_count,
+        extraction_attempts = r.extraction_attempts + excluded.extraction_attempts,
+        extraction_successes = r.extraction_successes + excluded.extraction_successes,
+        outcome_counts = r.outcome_counts || jsonb_build_object(outcome, coalesce((r.outcome_counts->>outcome)::int, 0) + 1),
+        updated_at = now();
+
+    return true;
+end;
+$$;
+
+create or replace function analytics_rollup(
+    p_start timestamptz,
+    p_end timestamptz,
+    p_group_by text,
+    p_agent_id uuid default null,
+    p_driver_id uuid default null
+)
+returns table (
+    group_key text,
+    group_label text,
+    calls bigint,
+    completed bigint,
+    failed bigint,
+    emergencies bigint,
+    duration_ms_sum bigint,
+    duration_count bigint,
+    extraction_attempts bigint,
+    extraction_successes bigint,
+    outcomes jsonb
+)
+language sql
+stable
+as $$
+    with rows as (
+        select
+            case p_group_by
+                when 'hour' then to_char(r.bucket_start at time zone 'UTC', 'YYYY-MM-DD"T"HH24:00:00"Z"')
+                when 'day' then to_char(r.bucket_start at time zone 'UTC', 'YYYY-MM-DD')
+                when 'agent' then r.agent_id::text
+                when 'driver' then r.driver_id::text
+                else 'all'
+            end as group_key,
+            r.*
+        from conversation_rollups r
+        where r.bucket_start >= p_start
+          and r.bucket_start < p_end
+          and (p_agent_id is null or r.agent_id = p_agent_id)
+          and (p_driver_id is null or r.driver_id = p_driver_id)
+    ),
+    totals as (
+        select
+            group_key,
+            sum(calls)::bigint as calls,
+            sum(completed)::bigint as completed,
+            sum(failed)::bigint as failed,
+            sum(emergencies)::bigint as emergencies,
+            sum(duration_ms_sum)::bigint as duration_ms_sum,
+            sum(duration_count)::bigint as duration_count,
+            sum(extraction_attempts)::bigint as extraction_attempts,
+            sum(extraction_successes)::bigint as extraction_successes
+        from rows
+        group by group_key
+    ),
+    outcomes as (
+        select group_key, jsonb_object_agg(outcome, total) as outcomes
+        from (
+            select rows.group_key, o.key as outcome, sum(o.value::bigint) as total
+            from rows, jsonb_each_text(rows.outcome_counts) o
+            group by rows.group_key, o.key
+        ) per_outcome
+        group by group_key
+    )
+    select
+        t.group_key,
+        coalesce(a.name, d.name, t.group_key),
+        t.calls,
+        t.completed,
+        t.failed,
+        t.emergencies,
+        t.duration_ms_sum,
+        t.duration_count,
+        t.extraction_attempts,
+        t.extraction_successes,
+        coalesce(o.outcomes, '{}'::jsonb)
+    from totals t
+    left join outcomes o on o.group_key = t.group_key
+    left join agents a on p_group_by = 'agent' and a.id::text = t.group_key
+    left join drivers d on p_group_by = 'driver' and d.id::text = t.group_key
+    order by t.group_key;
+$$;
+
+select record_conversation_rollup(id)
+from conversations
+where status in ('completed', 'failed');
@@ -0,0 +1,43 @@
+create temporary table phone_defaults as
+select coalesce(nullif(current_setting('app.default_phone_country_code', true), ''), '1') as country_code;
+
+update drivers
+set phone_number = case
+    when phone_number ~ '^\s*(\+|00)' then '+' || regexp_replace(regexp_replace(phone_number, '^\s*(\+|00)', ''), '\D', '', 'g')
+    when length(regexp_replace(phone_number, '\D', '', 'g')) = 10 then '+' || p.country_code || regexp_replace(phone_number, '\D', '', 'g')
+    when length(regexp_replace(phone_number, '\D', '', 'g')) = length(p.country_code) + 10 and regexp_replace(phone_number, '\D', '', 'g') like p.country_code || '%' then '+' || regexp_replace(phone_number, '\D', '', 'g')
+    else phone_number
+end
+from phone_defaults p;
+
+drop table phone_defaults;
+
+create temporary table driver_duplicates as
+select id, keep_id
+from (
+    select id, first_value(id) over (partition by phone_number order by created_at, id) as keep_id
+    from drivers
+) ranked
+where id <> keep_id;
+
+update conversations c
+set driver_id = d.keep_id
+from driver_duplicates d
+where c.driver_id = d.id;
+
+delete from conversation_rollups
+where driver_id in (select id from driver_duplicates union select keep_id from driver_duplicates);
+
+delete from conversation_rollup_log
+where conversation_id in (select id from conversations where driver_id in (select keep_id from driver_duplicates));
+
+select record_conversation_rollup(id)
+from conversations
+where driver_id in (select keep_id from driver_duplicates) and status in ('completed', 'failed');
+
+delete from drivers
+where id in (select id from driver_duplicates);
+
+drop table driver_duplicates;
+
+create unique index if not exists drivers_phone_number_key on drivers (phone_number);
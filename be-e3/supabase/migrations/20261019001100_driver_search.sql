@@ -0,0 +1,40 @@
+create extension if not exists pg_trgm;
+
+create index if not exists drivers_name_trgm_idx on drivers using gin (lower(name) gin_trgm_ops);
+create index if not exists drivers_phone_number_trgm_idx on drivers using gin (phone_number gin_trgm_ops);
+
+create or replace function search_drivers(p_query text, p_limit integer)
+returns table (
+    id uuid,
+    name text,
+    phone_number text,
+    created_at timestamptz,
+    score real
+)
+language sql
+stable
+as $$
+    with q as (
+        select
+            lower(trim(p_query)) as term,
+            replace(replace(replace(lower(trim(p_query)), '\', '\\'), '%', '\%'), '_', '\_') as pattern,
+            regexp_replace(p_query, '\D', '', 'g') as digits
+    )
+    select
+        d.id,
+        d.name,
+        d.phone_number,
+        d.created_at,
+        greatest(
+            case when lower(d.name) like q.pattern || '%' then 1.0 else 0 end,
+            case when lower(d.name) like '% ' || q.pattern || '%' then 0.9 else 0 end,
+            case when length(q.digits) >= 3 and d.phone_number like '%' || q.digits || '%' then 0.8 else 0 end,
+            word_similarity(q.term, lower(d.name)) * 0.7
+        )::real as score
+    from drivers d, q
+    where lower(d.name) like '%' || q.pattern || '%'
+       or q.term <% lower(d.name)
+       or (length(q.digits) >= 3 and d.phone_number like '%' || q.digits || '%')
+    order by score desc, d.name
+    limit p_limit;
+$$;
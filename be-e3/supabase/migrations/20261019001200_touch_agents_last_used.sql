@@ -0,0 +1,17 @@
+create or replace function touch_agents_last_used(p_updates jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+    touched integer;
+begin
+    update agents a
+    set last_used_at = u.last_used_at
+    from jsonb_to_recordset(p_updates) as u(id uuid, last_used_at timestamptz)
+    where a.id = u.id
+      and (a.last_used_at is null or a.last_used_at < u.last_used_at);
+
+    get diagnostics touched = row_count;
+    return touched;
+end;
+$$;
@@ -0,0 +1,38 @@
+alter table conversations add column if not exists transcript_utterances jsonb;
+alter table conversations add column if not exists utterance_count integer;
+
+alter table conversations alter column transcript_utterances set compression lz4;
+
+create or replace function conversation_utterances(
+    p_conversation_id uuid,
+    p_offset integer default 0,
+    p_limit integer default null,
+    p_include_words boolean default false
+)
+returns table (
+    seq integer,
+    role text,
+    content text,
+    start_ms integer,
+    end_ms integer,
+    created_at timestamptz,
+    words jsonb
+)
+language sql
+stable
+as $$
+    select
+        (u.ordinality - 1)::integer,
+        u.value->>'role',
+        u.value->>'content',
+        (u.value->>'start_ms')::integer,
+        (u.value->>'end_ms')::integer,
+        c.started_at + coalesce((u.value->>'start_ms')::integer, 0) * interval '1 millisecond',
+        case when p_include_words then u.value->'words' end
+    from conversations c
+    cross join lateral jsonb_array_elements(c.transcript_utterances) with ordinality as u(value, ordinality)
+    where c.id = p_conversation_id
+    order by u.ordinality
+    offset greatest(p_offset, 0)
+    limit p_limit;
+$$;
@@ -0,0 +1,32 @@
+alter table messages add column if not exists seq integer;
+
+update messages m
+set seq = ranked.seq
+from (
+    select id, (row_number() over (partition by conversation_id order by created_at, id) - 1)::integer as seq
+    from messages
+) ranked
+where m.id = ranked.id and m.seq is null;
+
+create or replace function assign_message_seq()
+returns trigger
+language plpgsql
+as $$
+begin
+    if new.seq is null then
+        select coalesce(max(seq) + 1, 0) into new.seq
+        from messages
+        where conversation_id = new.conversation_id;
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists messages_assign_seq on messages;
+create trigger messages_assign_seq
+before insert on messages
+for each row execute function assign_message_seq();
+
+alter table messages alter column seq set not null;
+
+create unique index if not exists messages_conversation_seq_key on messages (conversation_id, seq);
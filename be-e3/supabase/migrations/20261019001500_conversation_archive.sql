@@ -0,0 +1,92 @@
+create table if not exists conversation_archive (
+    id uuid not null,
+    started_at timestamptz not null,
+    agent_id uuid references agents(id) on delete set null,
+    driver_id uuid references drivers(id) on delete set null,
+    load_number text,
+    status text not null,
+    completed_at timestamptz,
+    record jsonb compression lz4 not null,
+    messages jsonb compression lz4 not null default '[]'::jsonb,
+    archived_at timestamptz not null default now(),
+    primary key (id, started_at)
+) partition by range (started_at);
+
+create index if not exists conversation_archive_id_idx on conversation_archive (id);
+
+create table if not exists conversation_archive_default partition of conversation_archive default;
+
+create or replace function ensure_conversation_archive_partition(p_month timestamptz)
+returns void
+language plpgsql
+as $$
+declare
+    month_start timestamptz := date_trunc('month', p_month, 'UTC');
+begin
+    execute format(
+        'create table if not exists %I partition of conversation_archive for values from (%L) to (%L)',
+        'conversation_archive_' || to_char(month_start at time zone 'UTC', 'YYYY_MM'),
+        month_start,
+        month_start + interval '1 month'
+    );
+end;
+$$;
+
+create or replace function archive_conversations(p_before timestamptz, p_limit integer)
+returns integer
+language plpgsql
+as $$
+declare
+    ids uuid[];
+    month timestamptz;
+    archived integer;
+begin
+    select array_agg(id) into ids
+    from (
+        select id
+        from conversations
+        where started_at < p_before and status in ('completed', 'failed')
+        order by started_at
+        limit p_limit
+        for update skip locked
+    ) batch;
+
+    if ids is null then
+        return 0;
+    end if;
+
+    for month in
+        select distinct date_trunc('month', started_at, 'UTC') from conversations where id = any(ids)
+    loop
+        perform ensure_conversation_archive_partition(month);
+    end loop;
+
+    insert into conversation_archive (id, started_at, agent_id, driver_id, load_number, status, completed_at, record, messages)
+    select
+        c.id,
+        c.started_at,
+        c.agent_id,
+        c.driver_id,
+        c.load_number,
+        c.status::text,
+        c.completed_at,
+        to_jsonb(c) - 'transcript_tsv',
+        coalesce((
+            select jsonb_agg(
+                jsonb_build_object('id', m.id, 'seq', m.seq, 'role', m.role, 'content', m.content, 'created_at', m.created_at)
+                order by m.seq
+            )
+            from messages m
+            where m.conversation_id = c.id
+        ), '[]'::jsonb)
+    from conversations c
+    where c.id = any(ids)
+    on conflict do nothing;
+
+    delete from messages where conversation_id = any(ids);
+    delete from conversations where id = any(ids);
+    get diagnostics archived = row_count;
+
+    return archived;
+end;
+$$;
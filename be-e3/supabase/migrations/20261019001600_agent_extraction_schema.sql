@@ -0,0 +1 @@
+alter table agents add column if not exists extraction_schema jsonb;
@@ -0,0 +1,8 @@
+alter table conversations
+    add column if not exists last_swept_at timestamptz,
+    add column if not exists sweep_attempts integer not null default 0;
+
+drop index if exists conversations_active_swept_idx;
+create index conversations_active_swept_idx
+    on conversations (last_swept_at nulls first, started_at)
+    where status in ('pending', 'in_progress', 'processing');
@@ -0,0 +1,66 @@
+import os
+import uuid
+from unittest.mock import patch
+
+for key in ["SUPABASE_URL", "SUPABASE_KEY", "API_KEY", "RETELL_API_KEY", "OPENAI_API_KEY"]:
+    os.environ.setdefault(key, "http://localhost" if key == "SUPABASE_URL" else "test")
+
+import httpx
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.main import app
+
+CONVERSATION_ID = str(uuid.uuid4())
+RECORD = {
+    "id": CONVERSATION_ID,
+    "agent_id": str(uuid.uuid4()),
+    "driver_id": str(uuid.uuid4()),
+    "load_number": "L-100",
+    "status": "completed",
+    "started_at": "2025-01-01T00:00:00+00:00",
+    "completed_at": "2025-01-01T00:05:00+00:00",
+    "transcript": "Agent: Hi\nUser: On my way",
+    "structured_data": {"call_outcome": "In-Transit Update"},
+    "recording_url": None,
+    "duration_ms": 300000,
+    "emergency_detected": False
+}
+ARCHIVED_MESSAGES = [
+    {"id": str(uuid.uuid4()), "seq": 0, "role": "agent", "content": "Hi", "created_at": "2025-01-01T00:00:01+00:00"},
+    {"id": str(uuid.uuid4()), "seq": 1, "role": "human", "content": "On my way", "created_at": "2025-01-01T00:00:02+00:00"}
+]
+
+def fake_request(self, method, url, **kwargs):
+    request = httpx.Request(method, url)
+    if str(url).endswith("/conversation_archive"):
+        row = {
+            "record": dict(RECORD),
+            "agents": {"name": "Dispatch"},
+            "drivers": {"name": "Sam"},
+            "messages": ARCHIVED_MESSAGES,
+            "started_at": RECORD["started_at"],
+            "transcript_utterances": None
+        }
+        return httpx.Response(200, json=[row], request=request)
+    return httpx.Response(200, json=[], request=request)
+
+def get(path: str) -> httpx.Response:
+    with patch.object(settings, "transcript_storage_mode", "messages"), patch.object(httpx.Client, "request", fake_request):
+        return TestClient(app).get(path, headers={"x-api-key": settings.api_key})
+
+def test_archived_messages_are_readable_in_messages_mode():
+    response = get(f"/api/conversations/{CONVERSATION_ID}/messages")
+
+    assert response.status_code == 200
+    messages = response.json()
+    assert [message["seq"] for message in messages] == [0, 1]
+    assert all(message["conversation_id"] == CONVERSATION_ID for message in messages)
+
+def test_archived_detail_includes_messages_in_messages_mode():
+    response = get(f"/api/conversations/{CONVERSATION_ID}/detail?include=messages,agent")
+
+    assert response.status_code == 200
+    detail = response.json()
+    assert detail["agent_name"] == "Dispatch"
+    assert [message["content"] for message in detail["messages"]] == ["Hi", "On my way"]
+    assert all(message["conversation_id"] == CONVERSATION_ID for message in detail["messages"])
@@ -5,8 +5,7 @@ import { Badge } from '@/components/ui/badge'
 import { Separator } from '@/components/ui/separator'
 import { MessageBubble } from './MessageBubble'
 import { StructuredDataDisplay } from './StructuredDataDisplay'
-import { useConversation, useConversationMessages } from '@/lib/hooks/useConversations'
-import { useStructuredData } from '@/lib/hooks/useStructuredData'
+import { useConversationDetail } from '@/lib/hooks/useConversations'
 import { ConversationStatus } from '@/types/conversation'
 import { formatDate } from '@/lib/utils'
 
@@ -18,16 +17,16 @@ interface ConversationDetailProps {
 const statusColors = {
   [ConversationStatus.PENDING]: 'bg-yellow-500',
   [ConversationStatus.IN_PROGRESS]: 'bg-blue-500',
+  [ConversationStatus.PROCESSING]: 'bg-purple-500',
   [ConversationStatus.COMPLETED]: 'bg-green-500',
   [ConversationStatus.FAILED]: 'bg-red-500',
 }
 
 export function ConversationDetail({ conversationId, onClose }: ConversationDetailProps) {
-  const { data: conversation, isLoading: conversationLoading } = useConversation(conversationId)
-  const { data: messages = [], isLoading: messagesLoading } = useConversationMessages(conversationId)
-  const { data: structuredDataResponse } = useStructuredData(conversationId)
+  const { data: conversation, isLoading } = useConversationDetail(conversationId)
+  const messages = conversation?.messages ?? []
 
-  if (conversationLoading || messagesLoading) {
+  if (isLoading) {
     return (
       <Card className="h-full">
         <CardContent className="flex items-center justify-center h-full">
@@ -78,12 +77,12 @@ export function ConversationDetail({ conversationId, onClose }: ConversationDeta
 
         <Separator />
 
-        {conversation.status === ConversationStatus.COMPLETED && structuredDataResponse?.structured_data && (
+        {conversation.status === ConversationStatus.COMPLETED && conversation.structured_data && (
           <>
             <StructuredDataDisplay
-              structuredData={structuredDataResponse.structured_data}
-              recordingUrl={structuredDataResponse.recording_url}
-              durationMs={structuredDataResponse.duration_ms}
+              structuredData={conversation.structured_data}
+              recordingUrl={conversation.recording_url}
+              durationMs={conversation.duration_ms}
             />
             <Separator />
           </>
@@ -18,6 +18,7 @@ interface ConversationListProps {
 const statusColors = {
   [ConversationStatus.PENDING]: 'bg-yellow-500',
   [ConversationStatus.IN_PROGRESS]: 'bg-blue-500',
+  [ConversationStatus.PROCESSING]: 'bg-purple-500',
   [ConversationStatus.COMPLETED]: 'bg-green-500',
   [ConversationStatus.FAILED]: 'bg-red-500',
 }
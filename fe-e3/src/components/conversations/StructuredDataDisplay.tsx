@@ -73,7 +73,7 @@ export function StructuredDataDisplay({ structuredData, recordingUrl, durationMs
         )}
         
         <div className="space-y-3">
-          {Object.entries(structuredData).map(([key, value]) => (
+          {Object.entries(structuredData).filter(([, value]) => value !== null && value !== undefined).map(([key, value]) => (
             <div key={key} className="grid grid-cols-3 gap-4 py-2 border-b last:border-0">
               <dt className="text-sm font-medium text-muted-foreground">
                 {formatKey(key)}
@@ -19,6 +19,7 @@ interface StatusDisplayProps {
 const statusColors = {
   [ConversationStatus.PENDING]: 'bg-yellow-500',
   [ConversationStatus.IN_PROGRESS]: 'bg-blue-500',
+  [ConversationStatus.PROCESSING]: 'bg-purple-500',
   [ConversationStatus.COMPLETED]: 'bg-green-500',
   [ConversationStatus.FAILED]: 'bg-red-500',
 }
@@ -29,7 +30,7 @@ export function StatusDisplay({ conversation }: StatusDisplayProps) {
   const { data: structuredDataResponse } = useStructuredData(conversation.id)
 
   const currentStatus = statusData?.status || conversation.status
-  const isInProgress = currentStatus === ConversationStatus.IN_PROGRESS || currentStatus === ConversationStatus.PENDING
+  const isInProgress = currentStatus === ConversationStatus.IN_PROGRESS || currentStatus === ConversationStatus.PENDING || currentStatus === ConversationStatus.PROCESSING
 
   return (
     <Card>
@@ -1,4 +1,4 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import { useForm } from 'react-hook-form'
 import { zodResolver } from '@hookform/resolvers/zod'
 import * as z from 'zod'
@@ -21,11 +21,13 @@ import {
   SelectValue,
 } from '@/components/ui/select'
 import { Input } from '@/components/ui/input'
+import { SearchInput } from '@/components/ui/search-input'
 import { Separator } from '@/components/ui/separator'
 import { useAgents } from '@/lib/hooks/useAgents'
-import { useDrivers } from '@/lib/hooks/useDrivers'
+import { useDriverSearch } from '@/lib/hooks/useDrivers'
 import { AgentForm } from '@/components/agents/AgentForm'
 import { useCreateAgent } from '@/lib/hooks/useAgents'
+import type { Driver } from '@/types/driver'
 
 const testCallSchema = z.object({
   agent_id: z.string().min(1, 'Agent is required'),
@@ -63,7 +65,20 @@ export function TestCallForm({ onSubmit, isLoading }: TestCallFormProps) {
   const [agentFormOpen, setAgentFormOpen] = useState(false)
 
   const { data: agents = [] } = useAgents()
-  const { data: drivers = [] } = useDrivers()
+  const [driverSearch, setDriverSearch] = useState('')
+  const [debouncedDriverSearch, setDebouncedDriverSearch] = useState('')
+  const [selectedDriver, setSelectedDriver] = useState<Driver | null>(null)
+
+  useEffect(() => {
+    const timeout = setTimeout(() => setDebouncedDriverSearch(driverSearch), 200)
+    return () => clearTimeout(timeout)
+  }, [driverSearch])
+
+  const { data: driverResults = [] } = useDriverSearch(debouncedDriverSearch)
+  const drivers: Driver[] =
+    selectedDriver && !driverResults.some((driver) => driver.id === selectedDriver.id)
+      ? [selectedDriver, ...driverResults]
+      : driverResults
   const createAgent = useCreateAgent()
 
   const form = useForm<TestCallFormData>({
@@ -185,18 +200,35 @@ export function TestCallForm({ onSubmit, isLoading }: TestCallFormProps) {
                   render={({ field }) => (
                     <FormItem>
                       <FormLabel>Select Driver</FormLabel>
-                      <Select onValueChange={field.onChange} value={field.value}>
+                      <SearchInput
+                        value={driverSearch}
+                        onChange={setDriverSearch}
+                        placeholder="Search drivers by name or phone..."
+                      />
+                      <Select
+                        onValueChange={(value) => {
+                          field.onChange(value)
+                          setSelectedDriver(drivers.find((driver) => driver.id === value) ?? null)
+                        }}
+                        value={field.value}
+                      >
                         <FormControl>
                           <SelectTrigger>
                             <SelectValue placeholder="Choose a driver" />
                           </SelectTrigger>
                         </FormControl>
                         <SelectContent>
-                          {drivers.map((driver) => (
-                            <SelectItem key={driver.id} value={driver.id}>
-                              {driver.name} ({driver.phone_number})
-                            </SelectItem>
-                          ))}
+                          {drivers.length === 0 ? (
+                            <div className="px-2 py-1.5 text-sm text-muted-foreground">
+                              {debouncedDriverSearch.trim() ? 'No drivers found' : 'Type to search drivers'}
+                            </div>
+                          ) : (
+                            drivers.map((driver) => (
+                              <SelectItem key={driver.id} value={driver.id}>
+                                {driver.name} ({driver.phone_number})
+                              </SelectItem>
+                            ))
+                          )}
                         </SelectContent>
                       </Select>
                       <FormMessage />
@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { ConversationListItem, Conversation, ConversationStatusResponse, StructuredDataResponse } from '@/types/conversation'
+import type { ConversationListItem, Conversation, ConversationDetail, ConversationStatusResponse, StructuredDataResponse } from '@/types/conversation'
 import type { Message } from '@/types/message'
 
 export const conversationsApi = {
@@ -13,6 +13,12 @@ export const conversationsApi = {
     return data
   },
 
+  getDetail: async (id: string, include?: string[]): Promise<ConversationDetail> => {
+    const params = include ? { include: include.join(',') } : undefined
+    const { data } = await apiClient.get(`/api/conversations/${id}/detail`, { params })
+    return data
+  },
+
   getMessages: async (id: string): Promise<Message[]> => {
     const { data } = await apiClient.get(`/api/conversations/${id}/messages`)
     return data
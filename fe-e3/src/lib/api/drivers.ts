@@ -1,5 +1,5 @@
 import { apiClient } from './client'
-import type { Driver, DriverCreate, DriverUpdate } from '@/types/driver'
+import type { Driver, DriverCreate, DriverSearchResult, DriverUpdate } from '@/types/driver'
 
 export const driversApi = {
   list: async (): Promise<Driver[]> => {
@@ -7,6 +7,11 @@ export const driversApi = {
     return data
   },
 
+  search: async (query: string, limit = 10): Promise<DriverSearchResult[]> => {
+    const { data } = await apiClient.get('/api/drivers/search', { params: { q: query, limit } })
+    return data
+  },
+
   get: async (id: string): Promise<Driver> => {
     const { data } = await apiClient.get(`/api/drivers/${id}`)
     return data
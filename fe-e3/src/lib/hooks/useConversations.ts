@@ -16,6 +16,14 @@ export const useConversation = (id: string) => {
   })
 }
 
+export const useConversationDetail = (id: string) => {
+  return useQuery({
+    queryKey: ['conversations', id, 'detail'],
+    queryFn: () => conversationsApi.getDetail(id),
+    enabled: !!id,
+  })
+}
+
 export const useConversationMessages = (id: string) => {
   return useQuery({
     queryKey: ['conversations', id, 'messages'],
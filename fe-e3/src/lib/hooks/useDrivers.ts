@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useQuery, useMutation, useQueryClient, keepPreviousData } from '@tanstack/react-query'
 import { driversApi } from '../api/drivers'
 import type { DriverCreate, DriverUpdate } from '@/types/driver'
 
@@ -9,6 +9,17 @@ export const useDrivers = () => {
   })
 }
 
+export const useDriverSearch = (query: string) => {
+  const term = query.trim()
+  return useQuery({
+    queryKey: ['drivers', 'search', term],
+    queryFn: () => driversApi.search(term),
+    enabled: term.length > 0,
+    placeholderData: keepPreviousData,
+    staleTime: 30000,
+  })
+}
+
 export const useDriver = (id: string) => {
   return useQuery({
     queryKey: ['drivers', id],
@@ -88,6 +88,7 @@ export default function Conversations() {
                 <SelectItem value="all">All Status</SelectItem>
                 <SelectItem value={ConversationStatus.PENDING}>Pending</SelectItem>
                 <SelectItem value={ConversationStatus.IN_PROGRESS}>In Progress</SelectItem>
+                <SelectItem value={ConversationStatus.PROCESSING}>Processing</SelectItem>
                 <SelectItem value={ConversationStatus.COMPLETED}>Completed</SelectItem>
                 <SelectItem value={ConversationStatus.FAILED}>Failed</SelectItem>
               </SelectContent>
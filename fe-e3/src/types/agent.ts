@@ -5,6 +5,7 @@ export interface Agent {
   additional_details: string | null
   scenario_description: string | null
   system_prompt: string | null
+  extraction_schema?: Record<string, any> | null
   retell_agent_id: string | null
   created_at: string
   last_used_at: string | null
@@ -1,6 +1,9 @@
+import type { Message } from './message'
+
 export enum ConversationStatus {
   PENDING = 'pending',
   IN_PROGRESS = 'in_progress',
+  PROCESSING = 'processing',
   COMPLETED = 'completed',
   FAILED = 'failed'
 }
@@ -45,3 +48,9 @@ export interface StructuredDataResponse {
   recording_url: string | null
   duration_ms: number | null
 }
+
+export interface ConversationDetail extends Conversation {
+  agent_name?: string | null
+  driver_name?: string | null
+  messages?: Message[]
+}
@@ -15,3 +15,6 @@ export interface DriverUpdate {
   phone_number?: string
 }
 
+export interface DriverSearchResult extends Driver {
+  score: number
+}
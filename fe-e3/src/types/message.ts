@@ -9,5 +9,15 @@ export interface Message {
   role: MessageRole
   content: string
   created_at: string
+  seq?: number | null
+  start_ms?: number | null
+  end_ms?: number | null
+  words?: WordTiming[] | null
+}
+
+export interface WordTiming {
+  word: string
+  start_ms: number | null
+  end_ms: number | null
 }
 